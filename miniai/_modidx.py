@@ -10,6 +10,9 @@ d = {
     },
     "syms": {
         "miniai.activations": {
+            "miniai.activations.ActStats": ("15-activations.html#actstats", "miniai/activations.py"),
+            "miniai.activations.ActStats.__init__": ("15-activations.html#actstats.__init__", "miniai/activations.py"),
+            "miniai.activations.ActStats.add": ("15-activations.html#actstats.add", "miniai/activations.py"),
             "miniai.activations.ActivationStatsCB": ("15-activations.html#activationstatscb", "miniai/activations.py"),
             "miniai.activations.ActivationStatsCB.__init__": (
                 "15-activations.html#activationstatscb.__init__",
@@ -27,9 +30,23 @@ d = {
                 "15-activations.html#activationstatscb.plot_stats",
                 "miniai/activations.py",
             ),
+            "miniai.activations.DeterministicCB": ("15-activations.html#deterministiccb", "miniai/activations.py"),
+            "miniai.activations.DeterministicCB.__init__": (
+                "15-activations.html#deterministiccb.__init__",
+                "miniai/activations.py",
+            ),
+            "miniai.activations.DeterministicCB.before_fit": (
+                "15-activations.html#deterministiccb.before_fit",
+                "miniai/activations.py",
+            ),
+            "miniai.activations.DeterministicCB.cleanup_fit": (
+                "15-activations.html#deterministiccb.cleanup_fit",
+                "miniai/activations.py",
+            ),
             "miniai.activations.Hook": ("15-activations.html#hook", "miniai/activations.py"),
             "miniai.activations.Hook.__del__": ("15-activations.html#hook.__del__", "miniai/activations.py"),
             "miniai.activations.Hook.__init__": ("15-activations.html#hook.__init__", "miniai/activations.py"),
+            "miniai.activations.Hook.attach": ("15-activations.html#hook.attach", "miniai/activations.py"),
             "miniai.activations.Hook.remove": ("15-activations.html#hook.remove", "miniai/activations.py"),
             "miniai.activations.Hooks": ("15-activations.html#hooks", "miniai/activations.py"),
             "miniai.activations.Hooks.__del__": ("15-activations.html#hooks.__del__", "miniai/activations.py"),
@@ -37,18 +54,96 @@ d = {
             "miniai.activations.Hooks.__enter__": ("15-activations.html#hooks.__enter__", "miniai/activations.py"),
             "miniai.activations.Hooks.__exit__": ("15-activations.html#hooks.__exit__", "miniai/activations.py"),
             "miniai.activations.Hooks.__init__": ("15-activations.html#hooks.__init__", "miniai/activations.py"),
+            "miniai.activations.Hooks.attach": ("15-activations.html#hooks.attach", "miniai/activations.py"),
             "miniai.activations.Hooks.remove": ("15-activations.html#hooks.remove", "miniai/activations.py"),
             "miniai.activations.HooksCB": ("15-activations.html#hookscb", "miniai/activations.py"),
             "miniai.activations.HooksCB.__init__": ("15-activations.html#hookscb.__init__", "miniai/activations.py"),
             "miniai.activations.HooksCB.__iter__": ("15-activations.html#hookscb.__iter__", "miniai/activations.py"),
             "miniai.activations.HooksCB.__len__": ("15-activations.html#hookscb.__len__", "miniai/activations.py"),
-            "miniai.activations.HooksCB._hook_fn": ("15-activations.html#hookscb._hook_fn", "miniai/activations.py"),
-            "miniai.activations.HooksCB.after_fit": ("15-activations.html#hookscb.after_fit", "miniai/activations.py"),
+            "miniai.activations.HooksCB._active": ("15-activations.html#hookscb._active", "miniai/activations.py"),
+            "miniai.activations.HooksCB._hooks": ("15-activations.html#hookscb._hooks", "miniai/activations.py"),
+            "miniai.activations.HooksCB.before_batch": (
+                "15-activations.html#hookscb.before_batch",
+                "miniai/activations.py",
+            ),
             "miniai.activations.HooksCB.before_fit": (
                 "15-activations.html#hookscb.before_fit",
                 "miniai/activations.py",
             ),
+            "miniai.activations.HooksCB.cleanup_fit": (
+                "15-activations.html#hookscb.cleanup_fit",
+                "miniai/activations.py",
+            ),
+            "miniai.activations.ParamStats": ("15-activations.html#paramstats", "miniai/activations.py"),
+            "miniai.activations.ParamStats.__getitem__": (
+                "15-activations.html#paramstats.__getitem__",
+                "miniai/activations.py",
+            ),
+            "miniai.activations.ParamStats.__init__": (
+                "15-activations.html#paramstats.__init__",
+                "miniai/activations.py",
+            ),
+            "miniai.activations.ParamStats._after_step": (
+                "15-activations.html#paramstats._after_step",
+                "miniai/activations.py",
+            ),
+            "miniai.activations.ParamStats._alloc": ("15-activations.html#paramstats._alloc", "miniai/activations.py"),
+            "miniai.activations.ParamStats._before_step": (
+                "15-activations.html#paramstats._before_step",
+                "miniai/activations.py",
+            ),
+            "miniai.activations.ParamStats._layer_norms": (
+                "15-activations.html#paramstats._layer_norms",
+                "miniai/activations.py",
+            ),
+            "miniai.activations.ParamStats.attach": ("15-activations.html#paramstats.attach", "miniai/activations.py"),
+            "miniai.activations.ParamStats.remove": ("15-activations.html#paramstats.remove", "miniai/activations.py"),
+            "miniai.activations.ParamStatsCB": ("15-activations.html#paramstatscb", "miniai/activations.py"),
+            "miniai.activations.ParamStatsCB.__init__": (
+                "15-activations.html#paramstatscb.__init__",
+                "miniai/activations.py",
+            ),
+            "miniai.activations.ParamStatsCB._hooks": (
+                "15-activations.html#paramstatscb._hooks",
+                "miniai/activations.py",
+            ),
+            "miniai.activations.ParamStatsCB.plot_stats": (
+                "15-activations.html#paramstatscb.plot_stats",
+                "miniai/activations.py",
+            ),
+            "miniai.activations.ParamStatsCB.stats": (
+                "15-activations.html#paramstatscb.stats",
+                "miniai/activations.py",
+            ),
+            "miniai.activations.StatsHistory": ("15-activations.html#statshistory", "miniai/activations.py"),
+            "miniai.activations.StatsHistory.__getitem__": (
+                "15-activations.html#statshistory.__getitem__",
+                "miniai/activations.py",
+            ),
+            "miniai.activations.StatsHistory.__init__": (
+                "15-activations.html#statshistory.__init__",
+                "miniai/activations.py",
+            ),
+            "miniai.activations.StatsHistory.__len__": (
+                "15-activations.html#statshistory.__len__",
+                "miniai/activations.py",
+            ),
+            "miniai.activations.StatsHistory._downsample": (
+                "15-activations.html#statshistory._downsample",
+                "miniai/activations.py",
+            ),
+            "miniai.activations.StatsHistory.append": (
+                "15-activations.html#statshistory.append",
+                "miniai/activations.py",
+            ),
+            "miniai.activations.StatsHistory.due": ("15-activations.html#statshistory.due", "miniai/activations.py"),
+            "miniai.activations.StatsHistory.last": ("15-activations.html#statshistory.last", "miniai/activations.py"),
+            "miniai.activations.StatsHistory.steps": (
+                "15-activations.html#statshistory.steps",
+                "miniai/activations.py",
+            ),
             "miniai.activations.append_stats": ("15-activations.html#append_stats", "miniai/activations.py"),
+            "miniai.activations.deterministic": ("15-activations.html#deterministic", "miniai/activations.py"),
             "miniai.activations.get_stats_hist": ("15-activations.html#get_stats_hist", "miniai/activations.py"),
             "miniai.activations.get_stats_hist_min": (
                 "15-activations.html#get_stats_hist_min",
@@ -56,31 +151,274 @@ d = {
             ),
             "miniai.activations.set_seed": ("15-activations.html#set_seed", "miniai/activations.py"),
         },
+        "miniai.augment": {
+            "miniai.augment.BatchTransformCB": ("15h-augmentation.html#batchtransformcb", "miniai/augment.py"),
+            "miniai.augment.BatchTransformCB.__init__": (
+                "15h-augmentation.html#batchtransformcb.__init__",
+                "miniai/augment.py",
+            ),
+            "miniai.augment.BatchTransformCB.before_batch": (
+                "15h-augmentation.html#batchtransformcb.before_batch",
+                "miniai/augment.py",
+            ),
+            "miniai.augment.Normalize": ("15h-augmentation.html#normalize", "miniai/augment.py"),
+            "miniai.augment.Normalize.__init__": ("15h-augmentation.html#normalize.__init__", "miniai/augment.py"),
+            "miniai.augment.Normalize.forward": ("15h-augmentation.html#normalize.forward", "miniai/augment.py"),
+            "miniai.augment.RandomCrop": ("15h-augmentation.html#randomcrop", "miniai/augment.py"),
+            "miniai.augment.RandomCrop.__init__": ("15h-augmentation.html#randomcrop.__init__", "miniai/augment.py"),
+            "miniai.augment.RandomCrop.forward": ("15h-augmentation.html#randomcrop.forward", "miniai/augment.py"),
+            "miniai.augment.RandomFlip": ("15h-augmentation.html#randomflip", "miniai/augment.py"),
+            "miniai.augment.RandomFlip.__init__": ("15h-augmentation.html#randomflip.__init__", "miniai/augment.py"),
+            "miniai.augment.RandomFlip.forward": ("15h-augmentation.html#randomflip.forward", "miniai/augment.py"),
+            "miniai.augment.RandomNoise": ("15h-augmentation.html#randomnoise", "miniai/augment.py"),
+            "miniai.augment.RandomNoise.__init__": ("15h-augmentation.html#randomnoise.__init__", "miniai/augment.py"),
+            "miniai.augment.RandomNoise.forward": ("15h-augmentation.html#randomnoise.forward", "miniai/augment.py"),
+            "miniai.augment._per_item": ("15h-augmentation.html#_per_item", "miniai/augment.py"),
+        },
+        "miniai.bench": {
+            "miniai.bench.StepTimerCB": ("15f-benchmarks.html#steptimercb", "miniai/bench.py"),
+            "miniai.bench.StepTimerCB._timed_batch": (
+                "15f-benchmarks.html#steptimercb._timed_batch",
+                "miniai/bench.py",
+            ),
+            "miniai.bench.StepTimerCB.before_fit": ("15f-benchmarks.html#steptimercb.before_fit", "miniai/bench.py"),
+            "miniai.bench.StepTimerCB.cleanup_fit": ("15f-benchmarks.html#steptimercb.cleanup_fit", "miniai/bench.py"),
+            "miniai.bench._NoopCB": ("15f-benchmarks.html#_noopcb", "miniai/bench.py"),
+            "miniai.bench._NoopCB.after_batch": ("15f-benchmarks.html#_noopcb.after_batch", "miniai/bench.py"),
+            "miniai.bench._NoopCB.before_batch": ("15f-benchmarks.html#_noopcb.before_batch", "miniai/bench.py"),
+            "miniai.bench._flatten": ("15f-benchmarks.html#_flatten", "miniai/bench.py"),
+            "miniai.bench._git_commit": ("15f-benchmarks.html#_git_commit", "miniai/bench.py"),
+            "miniai.bench._median_run": ("15f-benchmarks.html#_median_run", "miniai/bench.py"),
+            "miniai.bench.bench_callback_overhead": ("15f-benchmarks.html#bench_callback_overhead", "miniai/bench.py"),
+            "miniai.bench.bench_collate": ("15f-benchmarks.html#bench_collate", "miniai/bench.py"),
+            "miniai.bench.bench_conv": ("15f-benchmarks.html#bench_conv", "miniai/bench.py"),
+            "miniai.bench.bench_learner": ("15f-benchmarks.html#bench_learner", "miniai/bench.py"),
+            "miniai.bench.bench_momentum_learner": ("15f-benchmarks.html#bench_momentum_learner", "miniai/bench.py"),
+            "miniai.bench.bench_show_images": ("15f-benchmarks.html#bench_show_images", "miniai/bench.py"),
+            "miniai.bench.bench_train_cb": ("15f-benchmarks.html#bench_train_cb", "miniai/bench.py"),
+            "miniai.bench.bench_training_fit": ("15f-benchmarks.html#bench_training_fit", "miniai/bench.py"),
+            "miniai.bench.compare": ("15f-benchmarks.html#compare", "miniai/bench.py"),
+            "miniai.bench.conv_model": ("15f-benchmarks.html#conv_model", "miniai/bench.py"),
+            "miniai.bench.main": ("15f-benchmarks.html#main", "miniai/bench.py"),
+            "miniai.bench.mlp": ("15f-benchmarks.html#mlp", "miniai/bench.py"),
+            "miniai.bench.run_benchmarks": ("15f-benchmarks.html#run_benchmarks", "miniai/bench.py"),
+            "miniai.bench.summarise": ("15f-benchmarks.html#summarise", "miniai/bench.py"),
+            "miniai.bench.synthetic_data": ("15f-benchmarks.html#synthetic_data", "miniai/bench.py"),
+            "miniai.bench.synthetic_dls": ("15f-benchmarks.html#synthetic_dls", "miniai/bench.py"),
+            "miniai.bench.synthetic_hf_dataset": ("15f-benchmarks.html#synthetic_hf_dataset", "miniai/bench.py"),
+        },
+        "miniai.checkpoint": {
+            "miniai.checkpoint.AsyncSaver": ("15e-checkpoints.html#asyncsaver", "miniai/checkpoint.py"),
+            "miniai.checkpoint.AsyncSaver.__init__": (
+                "15e-checkpoints.html#asyncsaver.__init__",
+                "miniai/checkpoint.py",
+            ),
+            "miniai.checkpoint.AsyncSaver._raise": ("15e-checkpoints.html#asyncsaver._raise", "miniai/checkpoint.py"),
+            "miniai.checkpoint.AsyncSaver._run": ("15e-checkpoints.html#asyncsaver._run", "miniai/checkpoint.py"),
+            "miniai.checkpoint.AsyncSaver._write": ("15e-checkpoints.html#asyncsaver._write", "miniai/checkpoint.py"),
+            "miniai.checkpoint.AsyncSaver.checkpoints": (
+                "15e-checkpoints.html#asyncsaver.checkpoints",
+                "miniai/checkpoint.py",
+            ),
+            "miniai.checkpoint.AsyncSaver.save": ("15e-checkpoints.html#asyncsaver.save", "miniai/checkpoint.py"),
+            "miniai.checkpoint.AsyncSaver.wait": ("15e-checkpoints.html#asyncsaver.wait", "miniai/checkpoint.py"),
+            "miniai.checkpoint.CheckpointCB": ("15e-checkpoints.html#checkpointcb", "miniai/checkpoint.py"),
+            "miniai.checkpoint.CheckpointCB.__init__": (
+                "15e-checkpoints.html#checkpointcb.__init__",
+                "miniai/checkpoint.py",
+            ),
+            "miniai.checkpoint.CheckpointCB.after_batch": (
+                "15e-checkpoints.html#checkpointcb.after_batch",
+                "miniai/checkpoint.py",
+            ),
+            "miniai.checkpoint.CheckpointCB.after_epoch": (
+                "15e-checkpoints.html#checkpointcb.after_epoch",
+                "miniai/checkpoint.py",
+            ),
+            "miniai.checkpoint.CheckpointCB.before_batch": (
+                "15e-checkpoints.html#checkpointcb.before_batch",
+                "miniai/checkpoint.py",
+            ),
+            "miniai.checkpoint.CheckpointCB.before_epoch": (
+                "15e-checkpoints.html#checkpointcb.before_epoch",
+                "miniai/checkpoint.py",
+            ),
+            "miniai.checkpoint.CheckpointCB.before_fit": (
+                "15e-checkpoints.html#checkpointcb.before_fit",
+                "miniai/checkpoint.py",
+            ),
+            "miniai.checkpoint.CheckpointCB.cleanup_fit": (
+                "15e-checkpoints.html#checkpointcb.cleanup_fit",
+                "miniai/checkpoint.py",
+            ),
+            "miniai.checkpoint.CheckpointCB.generator": (
+                "15e-checkpoints.html#checkpointcb.generator",
+                "miniai/checkpoint.py",
+            ),
+            "miniai.checkpoint.CheckpointCB.load": ("15e-checkpoints.html#checkpointcb.load", "miniai/checkpoint.py"),
+            "miniai.checkpoint.CheckpointCB.save": ("15e-checkpoints.html#checkpointcb.save", "miniai/checkpoint.py"),
+            "miniai.checkpoint._SkipBatchSampler": ("15e-checkpoints.html#_skipbatchsampler", "miniai/checkpoint.py"),
+            "miniai.checkpoint._SkipBatchSampler.__init__": (
+                "15e-checkpoints.html#_skipbatchsampler.__init__",
+                "miniai/checkpoint.py",
+            ),
+            "miniai.checkpoint._SkipBatchSampler.__iter__": (
+                "15e-checkpoints.html#_skipbatchsampler.__iter__",
+                "miniai/checkpoint.py",
+            ),
+            "miniai.checkpoint._SkipBatchSampler.__len__": (
+                "15e-checkpoints.html#_skipbatchsampler.__len__",
+                "miniai/checkpoint.py",
+            ),
+            "miniai.checkpoint._SkipLoader": ("15e-checkpoints.html#_skiploader", "miniai/checkpoint.py"),
+            "miniai.checkpoint._SkipLoader.__init__": (
+                "15e-checkpoints.html#_skiploader.__init__",
+                "miniai/checkpoint.py",
+            ),
+            "miniai.checkpoint._SkipLoader.__iter__": (
+                "15e-checkpoints.html#_skiploader.__iter__",
+                "miniai/checkpoint.py",
+            ),
+            "miniai.checkpoint._SkipLoader.__len__": (
+                "15e-checkpoints.html#_skiploader.__len__",
+                "miniai/checkpoint.py",
+            ),
+            "miniai.checkpoint.get_rng_state": ("15e-checkpoints.html#get_rng_state", "miniai/checkpoint.py"),
+            "miniai.checkpoint.latest_checkpoint": ("15e-checkpoints.html#latest_checkpoint", "miniai/checkpoint.py"),
+            "miniai.checkpoint.set_rng_state": ("15e-checkpoints.html#set_rng_state", "miniai/checkpoint.py"),
+            "miniai.checkpoint.skip_batches": ("15e-checkpoints.html#skip_batches", "miniai/checkpoint.py"),
+            "miniai.checkpoint.snapshot": ("15e-checkpoints.html#snapshot", "miniai/checkpoint.py"),
+        },
         "miniai.conv": {
             "miniai.conv.collate_device": ("15-convolutions.html#collate_device", "miniai/conv.py"),
             "miniai.conv.conv": ("15-convolutions.html#conv", "miniai/conv.py"),
             "miniai.conv.to_device": ("15-convolutions.html#to_device", "miniai/conv.py"),
         },
         "miniai.datasets": {
+            "miniai.datasets.ColumnarDataset": ("14-huggingface-datasets.html#columnardataset", "miniai/datasets.py"),
+            "miniai.datasets.ColumnarDataset.__getitem__": (
+                "14-huggingface-datasets.html#columnardataset.__getitem__",
+                "miniai/datasets.py",
+            ),
+            "miniai.datasets.ColumnarDataset.__getitems__": (
+                "14-huggingface-datasets.html#columnardataset.__getitems__",
+                "miniai/datasets.py",
+            ),
+            "miniai.datasets.ColumnarDataset.__init__": (
+                "14-huggingface-datasets.html#columnardataset.__init__",
+                "miniai/datasets.py",
+            ),
+            "miniai.datasets.ColumnarDataset.__len__": (
+                "14-huggingface-datasets.html#columnardataset.__len__",
+                "miniai/datasets.py",
+            ),
+            "miniai.datasets.MemmapDataset": ("14-huggingface-datasets.html#memmapdataset", "miniai/datasets.py"),
+            "miniai.datasets.MemmapDataset.__getitem__": (
+                "14-huggingface-datasets.html#memmapdataset.__getitem__",
+                "miniai/datasets.py",
+            ),
+            "miniai.datasets.MemmapDataset.__getstate__": (
+                "14-huggingface-datasets.html#memmapdataset.__getstate__",
+                "miniai/datasets.py",
+            ),
+            "miniai.datasets.MemmapDataset.__init__": (
+                "14-huggingface-datasets.html#memmapdataset.__init__",
+                "miniai/datasets.py",
+            ),
+            "miniai.datasets.MemmapDataset.__setstate__": (
+                "14-huggingface-datasets.html#memmapdataset.__setstate__",
+                "miniai/datasets.py",
+            ),
+            "miniai.datasets._as_batch": ("14-huggingface-datasets.html#_as_batch", "miniai/datasets.py"),
+            "miniai.datasets._as_chw": ("14-huggingface-datasets.html#_as_chw", "miniai/datasets.py"),
+            "miniai.datasets._as_float": ("14-huggingface-datasets.html#_as_float", "miniai/datasets.py"),
+            "miniai.datasets._dir_size": ("14-huggingface-datasets.html#_dir_size", "miniai/datasets.py"),
+            "miniai.datasets._evict": ("14-huggingface-datasets.html#_evict", "miniai/datasets.py"),
+            "miniai.datasets._fill_cache": ("14-huggingface-datasets.html#_fill_cache", "miniai/datasets.py"),
+            "miniai.datasets._from_arrow": ("14-huggingface-datasets.html#_from_arrow", "miniai/datasets.py"),
+            "miniai.datasets._hash_global": ("14-huggingface-datasets.html#_hash_global", "miniai/datasets.py"),
+            "miniai.datasets._is_list": ("14-huggingface-datasets.html#_is_list", "miniai/datasets.py"),
+            "miniai.datasets._montage": ("14-huggingface-datasets.html#_montage", "miniai/datasets.py"),
+            "miniai.datasets._names": ("14-huggingface-datasets.html#_names", "miniai/datasets.py"),
+            "miniai.datasets._source": ("14-huggingface-datasets.html#_source", "miniai/datasets.py"),
+            "miniai.datasets._tfm_parts": ("14-huggingface-datasets.html#_tfm_parts", "miniai/datasets.py"),
+            "miniai.datasets._write_cache": ("14-huggingface-datasets.html#_write_cache", "miniai/datasets.py"),
+            "miniai.datasets.collate_columns": ("14-huggingface-datasets.html#collate_columns", "miniai/datasets.py"),
             "miniai.datasets.collate_dict": ("14-huggingface-datasets.html#collate_dict", "miniai/datasets.py"),
+            "miniai.datasets.column_to_tensor": ("14-huggingface-datasets.html#column_to_tensor", "miniai/datasets.py"),
             "miniai.datasets.get_grid": ("14-huggingface-datasets.html#get_grid", "miniai/datasets.py"),
             "miniai.datasets.inplace": ("14-huggingface-datasets.html#inplace", "miniai/datasets.py"),
+            "miniai.datasets.materialize": ("14-huggingface-datasets.html#materialize", "miniai/datasets.py"),
+            "miniai.datasets.montage": ("14-huggingface-datasets.html#montage", "miniai/datasets.py"),
             "miniai.datasets.show_image": ("14-huggingface-datasets.html#show_image", "miniai/datasets.py"),
             "miniai.datasets.show_images": ("14-huggingface-datasets.html#show_images", "miniai/datasets.py"),
+            "miniai.datasets.show_montage": ("14-huggingface-datasets.html#show_montage", "miniai/datasets.py"),
             "miniai.datasets.subplots": ("14-huggingface-datasets.html#subplots", "miniai/datasets.py"),
         },
+        "miniai.distributed": {
+            "miniai.distributed.DDPCB": ("15g-distributed.html#ddpcb", "miniai/distributed.py"),
+            "miniai.distributed.DDPCB.__init__": ("15g-distributed.html#ddpcb.__init__", "miniai/distributed.py"),
+            "miniai.distributed.DDPCB.before_epoch": (
+                "15g-distributed.html#ddpcb.before_epoch",
+                "miniai/distributed.py",
+            ),
+            "miniai.distributed.DDPCB.before_fit": ("15g-distributed.html#ddpcb.before_fit", "miniai/distributed.py"),
+            "miniai.distributed.DDPCB.cleanup_fit": ("15g-distributed.html#ddpcb.cleanup_fit", "miniai/distributed.py"),
+            "miniai.distributed._JoinLoader": ("15g-distributed.html#_joinloader", "miniai/distributed.py"),
+            "miniai.distributed._JoinLoader.__init__": (
+                "15g-distributed.html#_joinloader.__init__",
+                "miniai/distributed.py",
+            ),
+            "miniai.distributed._JoinLoader.__iter__": (
+                "15g-distributed.html#_joinloader.__iter__",
+                "miniai/distributed.py",
+            ),
+            "miniai.distributed._JoinLoader.__len__": (
+                "15g-distributed.html#_joinloader.__len__",
+                "miniai/distributed.py",
+            ),
+            "miniai.distributed._free_port": ("15g-distributed.html#_free_port", "miniai/distributed.py"),
+            "miniai.distributed._worker": ("15g-distributed.html#_worker", "miniai/distributed.py"),
+            "miniai.distributed.launch": ("15g-distributed.html#launch", "miniai/distributed.py"),
+            "miniai.distributed.shard_dl": ("15g-distributed.html#shard_dl", "miniai/distributed.py"),
+            "miniai.distributed.shard_dls": ("15g-distributed.html#shard_dls", "miniai/distributed.py"),
+        },
         "miniai.learner": {
             "miniai.learner.Callback": ("15c-learner.html#callback", "miniai/learner.py"),
             "miniai.learner.CancelBatchException": ("15c-learner.html#cancelbatchexception", "miniai/learner.py"),
             "miniai.learner.CancelEpochException": ("15c-learner.html#cancelepochexception", "miniai/learner.py"),
             "miniai.learner.CancelFitException": ("15c-learner.html#cancelfitexception", "miniai/learner.py"),
+            "miniai.learner.CancelInferenceException": (
+                "15c-learner.html#cancelinferenceexception",
+                "miniai/learner.py",
+            ),
+            "miniai.learner.CompileCB": ("15c-learner.html#compilecb", "miniai/learner.py"),
+            "miniai.learner.CompileCB.__init__": ("15c-learner.html#compilecb.__init__", "miniai/learner.py"),
+            "miniai.learner.CompileCB._fail": ("15c-learner.html#compilecb._fail", "miniai/learner.py"),
+            "miniai.learner.CompileCB._forward": ("15c-learner.html#compilecb._forward", "miniai/learner.py"),
+            "miniai.learner.CompileCB._loss": ("15c-learner.html#compilecb._loss", "miniai/learner.py"),
+            "miniai.learner.CompileCB._run": ("15c-learner.html#compilecb._run", "miniai/learner.py"),
+            "miniai.learner.CompileCB._sync": ("15c-learner.html#compilecb._sync", "miniai/learner.py"),
+            "miniai.learner.CompileCB._use_compiled": ("15c-learner.html#compilecb._use_compiled", "miniai/learner.py"),
+            "miniai.learner.CompileCB.after_batch": ("15c-learner.html#compilecb.after_batch", "miniai/learner.py"),
+            "miniai.learner.CompileCB.before_batch": ("15c-learner.html#compilecb.before_batch", "miniai/learner.py"),
+            "miniai.learner.CompileCB.before_fit": ("15c-learner.html#compilecb.before_fit", "miniai/learner.py"),
+            "miniai.learner.CompileCB.cleanup_fit": ("15c-learner.html#compilecb.cleanup_fit", "miniai/learner.py"),
+            "miniai.learner.CompileCB.report": ("15c-learner.html#compilecb.report", "miniai/learner.py"),
             "miniai.learner.DataLoaders": ("15c-learner.html#dataloaders", "miniai/learner.py"),
             "miniai.learner.DataLoaders.__init__": ("15c-learner.html#dataloaders.__init__", "miniai/learner.py"),
+            "miniai.learner.DataLoaders.autotune": ("15c-learner.html#dataloaders.autotune", "miniai/learner.py"),
             "miniai.learner.DataLoaders.from_dsd": ("15c-learner.html#dataloaders.from_dsd", "miniai/learner.py"),
+            "miniai.learner.DataLoaders.prefetch": ("15c-learner.html#dataloaders.prefetch", "miniai/learner.py"),
+            "miniai.learner.DataLoaders.seeded": ("15c-learner.html#dataloaders.seeded", "miniai/learner.py"),
             "miniai.learner.DeviceCB": ("15c-learner.html#devicecb", "miniai/learner.py"),
             "miniai.learner.DeviceCB.__init__": ("15c-learner.html#devicecb.__init__", "miniai/learner.py"),
             "miniai.learner.DeviceCB.before_batch": ("15c-learner.html#devicecb.before_batch", "miniai/learner.py"),
             "miniai.learner.DeviceCB.before_fit": ("15c-learner.html#devicecb.before_fit", "miniai/learner.py"),
+            "miniai.learner.DeviceCB.before_inference": (
+                "15c-learner.html#devicecb.before_inference",
+                "miniai/learner.py",
+            ),
             "miniai.learner.LRFinderCB": ("15c-learner.html#lrfindercb", "miniai/learner.py"),
             "miniai.learner.LRFinderCB.__init__": ("15c-learner.html#lrfindercb.__init__", "miniai/learner.py"),
             "miniai.learner.LRFinderCB.after_batch": ("15c-learner.html#lrfindercb.after_batch", "miniai/learner.py"),
@@ -89,19 +427,61 @@ d = {
             "miniai.learner.Learner": ("15c-learner.html#learner", "miniai/learner.py"),
             "miniai.learner.Learner.__getattr__": ("15c-learner.html#learner.__getattr__", "miniai/learner.py"),
             "miniai.learner.Learner.__init__": ("15c-learner.html#learner.__init__", "miniai/learner.py"),
+            "miniai.learner.Learner._accum_size": ("15c-learner.html#learner._accum_size", "miniai/learner.py"),
             "miniai.learner.Learner._fit": ("15c-learner.html#learner._fit", "miniai/learner.py"),
+            "miniai.learner.Learner._forward": ("15c-learner.html#learner._forward", "miniai/learner.py"),
+            "miniai.learner.Learner._inference": ("15c-learner.html#learner._inference", "miniai/learner.py"),
+            "miniai.learner.Learner._inference_batch": (
+                "15c-learner.html#learner._inference_batch",
+                "miniai/learner.py",
+            ),
+            "miniai.learner.Learner._micro_batches": ("15c-learner.html#learner._micro_batches", "miniai/learner.py"),
             "miniai.learner.Learner._one_epoch": ("15c-learner.html#learner._one_epoch", "miniai/learner.py"),
+            "miniai.learner.Learner._scaled_backward": (
+                "15c-learner.html#learner._scaled_backward",
+                "miniai/learner.py",
+            ),
+            "miniai.learner.Learner._should_step": ("15c-learner.html#learner._should_step", "miniai/learner.py"),
+            "miniai.learner.Learner.add_cb": ("15c-learner.html#learner.add_cb", "miniai/learner.py"),
             "miniai.learner.Learner.callback": ("15c-learner.html#learner.callback", "miniai/learner.py"),
             "miniai.learner.Learner.fit": ("15c-learner.html#learner.fit", "miniai/learner.py"),
+            "miniai.learner.Learner.get_preds": ("15c-learner.html#learner.get_preds", "miniai/learner.py"),
             "miniai.learner.Learner.one_batch": ("15c-learner.html#learner.one_batch", "miniai/learner.py"),
             "miniai.learner.Learner.one_epoch": ("15c-learner.html#learner.one_epoch", "miniai/learner.py"),
+            "miniai.learner.Learner.remove_cb": ("15c-learner.html#learner.remove_cb", "miniai/learner.py"),
             "miniai.learner.MetricsCB": ("15c-learner.html#metricscb", "miniai/learner.py"),
             "miniai.learner.MetricsCB.__init__": ("15c-learner.html#metricscb.__init__", "miniai/learner.py"),
+            "miniai.learner.MetricsCB._compute": ("15c-learner.html#metricscb._compute", "miniai/learner.py"),
             "miniai.learner.MetricsCB._log": ("15c-learner.html#metricscb._log", "miniai/learner.py"),
             "miniai.learner.MetricsCB.after_batch": ("15c-learner.html#metricscb.after_batch", "miniai/learner.py"),
             "miniai.learner.MetricsCB.after_epoch": ("15c-learner.html#metricscb.after_epoch", "miniai/learner.py"),
             "miniai.learner.MetricsCB.before_epoch": ("15c-learner.html#metricscb.before_epoch", "miniai/learner.py"),
             "miniai.learner.MetricsCB.before_fit": ("15c-learner.html#metricscb.before_fit", "miniai/learner.py"),
+            "miniai.learner.MixedPrecisionCB": ("15c-learner.html#mixedprecisioncb", "miniai/learner.py"),
+            "miniai.learner.MixedPrecisionCB.__init__": (
+                "15c-learner.html#mixedprecisioncb.__init__",
+                "miniai/learner.py",
+            ),
+            "miniai.learner.MixedPrecisionCB.after_forward": (
+                "15c-learner.html#mixedprecisioncb.after_forward",
+                "miniai/learner.py",
+            ),
+            "miniai.learner.MixedPrecisionCB.before_fit": (
+                "15c-learner.html#mixedprecisioncb.before_fit",
+                "miniai/learner.py",
+            ),
+            "miniai.learner.MixedPrecisionCB.before_forward": (
+                "15c-learner.html#mixedprecisioncb.before_forward",
+                "miniai/learner.py",
+            ),
+            "miniai.learner.MixedPrecisionCB.before_inference": (
+                "15c-learner.html#mixedprecisioncb.before_inference",
+                "miniai/learner.py",
+            ),
+            "miniai.learner.MixedPrecisionCB.cleanup_fit": (
+                "15c-learner.html#mixedprecisioncb.cleanup_fit",
+                "miniai/learner.py",
+            ),
             "miniai.learner.MomentumLearner": ("15c-learner.html#momentumlearner", "miniai/learner.py"),
             "miniai.learner.MomentumLearner.__init__": (
                 "15c-learner.html#momentumlearner.__init__",
@@ -121,9 +501,17 @@ d = {
                 "15c-learner.html#momentumlearner.zero_grad",
                 "miniai/learner.py",
             ),
+            "miniai.learner.PrefetchLoader": ("15c-learner.html#prefetchloader", "miniai/learner.py"),
+            "miniai.learner.PrefetchLoader.__init__": ("15c-learner.html#prefetchloader.__init__", "miniai/learner.py"),
+            "miniai.learner.PrefetchLoader.__iter__": ("15c-learner.html#prefetchloader.__iter__", "miniai/learner.py"),
+            "miniai.learner.PrefetchLoader.__len__": ("15c-learner.html#prefetchloader.__len__", "miniai/learner.py"),
+            "miniai.learner.PrefetchLoader._load": ("15c-learner.html#prefetchloader._load", "miniai/learner.py"),
+            "miniai.learner.PrefetchLoader._put": ("15c-learner.html#prefetchloader._put", "miniai/learner.py"),
             "miniai.learner.ProgressCB": ("15c-learner.html#progresscb", "miniai/learner.py"),
             "miniai.learner.ProgressCB.__init__": ("15c-learner.html#progresscb.__init__", "miniai/learner.py"),
+            "miniai.learner.ProgressCB._update": ("15c-learner.html#progresscb._update", "miniai/learner.py"),
             "miniai.learner.ProgressCB.after_batch": ("15c-learner.html#progresscb.after_batch", "miniai/learner.py"),
+            "miniai.learner.ProgressCB.after_epoch": ("15c-learner.html#progresscb.after_epoch", "miniai/learner.py"),
             "miniai.learner.ProgressCB.before_epoch": ("15c-learner.html#progresscb.before_epoch", "miniai/learner.py"),
             "miniai.learner.ProgressCB.before_fit": ("15c-learner.html#progresscb.before_fit", "miniai/learner.py"),
             "miniai.learner.TrainCB": ("15c-learner.html#traincb", "miniai/learner.py"),
@@ -132,11 +520,176 @@ d = {
             "miniai.learner.TrainCB.predict": ("15c-learner.html#traincb.predict", "miniai/learner.py"),
             "miniai.learner.TrainCB.step": ("15c-learner.html#traincb.step", "miniai/learner.py"),
             "miniai.learner.TrainCB.zero_grad": ("15c-learner.html#traincb.zero_grad", "miniai/learner.py"),
+            "miniai.learner._PredsBuffer": ("15c-learner.html#_predsbuffer", "miniai/learner.py"),
+            "miniai.learner._PredsBuffer.__init__": ("15c-learner.html#_predsbuffer.__init__", "miniai/learner.py"),
+            "miniai.learner._PredsBuffer._alloc": ("15c-learner.html#_predsbuffer._alloc", "miniai/learner.py"),
+            "miniai.learner._PredsBuffer.add": ("15c-learner.html#_predsbuffer.add", "miniai/learner.py"),
+            "miniai.learner._PredsBuffer.result": ("15c-learner.html#_predsbuffer.result", "miniai/learner.py"),
+            "miniai.learner._ScaledOptimizer": ("15c-learner.html#_scaledoptimizer", "miniai/learner.py"),
+            "miniai.learner._ScaledOptimizer.__getattr__": (
+                "15c-learner.html#_scaledoptimizer.__getattr__",
+                "miniai/learner.py",
+            ),
+            "miniai.learner._ScaledOptimizer.__init__": (
+                "15c-learner.html#_scaledoptimizer.__init__",
+                "miniai/learner.py",
+            ),
+            "miniai.learner._ScaledOptimizer.step": ("15c-learner.html#_scaledoptimizer.step", "miniai/learner.py"),
+            "miniai.learner._batch_len": ("15c-learner.html#_batch_len", "miniai/learner.py"),
+            "miniai.learner._batch_tensors": ("15c-learner.html#_batch_tensors", "miniai/learner.py"),
+            "miniai.learner._dl_key": ("15c-learner.html#_dl_key", "miniai/learner.py"),
+            "miniai.learner._n_items": ("15c-learner.html#_n_items", "miniai/learner.py"),
+            "miniai.learner._pin_memory": ("15c-learner.html#_pin_memory", "miniai/learner.py"),
+            "miniai.learner._powers_of_two": ("15c-learner.html#_powers_of_two", "miniai/learner.py"),
+            "miniai.learner._slice_batch": ("15c-learner.html#_slice_batch", "miniai/learner.py"),
+            "miniai.learner._time_dl": ("15c-learner.html#_time_dl", "miniai/learner.py"),
+            "miniai.learner._with_generator": ("15c-learner.html#_with_generator", "miniai/learner.py"),
+            "miniai.learner.autotune_dl": ("15c-learner.html#autotune_dl", "miniai/learner.py"),
+            "miniai.learner.get_cb_methods": ("15c-learner.html#get_cb_methods", "miniai/learner.py"),
+            "miniai.learner.is_distributed": ("15c-learner.html#is_distributed", "miniai/learner.py"),
+            "miniai.learner.is_main_process": ("15c-learner.html#is_main_process", "miniai/learner.py"),
             "miniai.learner.run_cbs": ("15c-learner.html#run_cbs", "miniai/learner.py"),
+            "miniai.learner.seed_worker": ("15c-learner.html#seed_worker", "miniai/learner.py"),
+            "miniai.learner.seeded": ("15c-learner.html#seeded", "miniai/learner.py"),
             "miniai.learner.to_cpu": ("15c-learner.html#to_cpu", "miniai/learner.py"),
+            "miniai.learner.to_detached": ("15c-learner.html#to_detached", "miniai/learner.py"),
+            "miniai.learner.with_batch_size": ("15c-learner.html#with_batch_size", "miniai/learner.py"),
             "miniai.learner.with_cbs": ("15c-learner.html#with_cbs", "miniai/learner.py"),
             "miniai.learner.with_cbs.__call__": ("15c-learner.html#with_cbs.__call__", "miniai/learner.py"),
             "miniai.learner.with_cbs.__init__": ("15c-learner.html#with_cbs.__init__", "miniai/learner.py"),
+            "miniai.learner.with_settings": ("15c-learner.html#with_settings", "miniai/learner.py"),
+        },
+        "miniai.profiling": {
+            "miniai.profiling.ProfileCB": ("15d-profiling.html#profilecb", "miniai/profiling.py"),
+            "miniai.profiling.ProfileCB.__init__": ("15d-profiling.html#profilecb.__init__", "miniai/profiling.py"),
+            "miniai.profiling.ProfileCB._stop_profiler": (
+                "15d-profiling.html#profilecb._stop_profiler",
+                "miniai/profiling.py",
+            ),
+            "miniai.profiling.ProfileCB._timed": ("15d-profiling.html#profilecb._timed", "miniai/profiling.py"),
+            "miniai.profiling.ProfileCB._timed_callback": (
+                "15d-profiling.html#profilecb._timed_callback",
+                "miniai/profiling.py",
+            ),
+            "miniai.profiling.ProfileCB.after_batch": (
+                "15d-profiling.html#profilecb.after_batch",
+                "miniai/profiling.py",
+            ),
+            "miniai.profiling.ProfileCB.after_fit": ("15d-profiling.html#profilecb.after_fit", "miniai/profiling.py"),
+            "miniai.profiling.ProfileCB.before_batch": (
+                "15d-profiling.html#profilecb.before_batch",
+                "miniai/profiling.py",
+            ),
+            "miniai.profiling.ProfileCB.before_epoch": (
+                "15d-profiling.html#profilecb.before_epoch",
+                "miniai/profiling.py",
+            ),
+            "miniai.profiling.ProfileCB.before_fit": ("15d-profiling.html#profilecb.before_fit", "miniai/profiling.py"),
+            "miniai.profiling.ProfileCB.cleanup_fit": (
+                "15d-profiling.html#profilecb.cleanup_fit",
+                "miniai/profiling.py",
+            ),
+            "miniai.profiling.ProfileCB.summary": ("15d-profiling.html#profilecb.summary", "miniai/profiling.py"),
+            "miniai.profiling.TimingHist": ("15d-profiling.html#timinghist", "miniai/profiling.py"),
+            "miniai.profiling.TimingHist.__init__": ("15d-profiling.html#timinghist.__init__", "miniai/profiling.py"),
+            "miniai.profiling.TimingHist.add": ("15d-profiling.html#timinghist.add", "miniai/profiling.py"),
+            "miniai.profiling.TimingHist.mean": ("15d-profiling.html#timinghist.mean", "miniai/profiling.py"),
+            "miniai.profiling.TimingHist.quantile": ("15d-profiling.html#timinghist.quantile", "miniai/profiling.py"),
+            "miniai.profiling._TimedLoader": ("15d-profiling.html#_timedloader", "miniai/profiling.py"),
+            "miniai.profiling._TimedLoader.__init__": (
+                "15d-profiling.html#_timedloader.__init__",
+                "miniai/profiling.py",
+            ),
+            "miniai.profiling._TimedLoader.__iter__": (
+                "15d-profiling.html#_timedloader.__iter__",
+                "miniai/profiling.py",
+            ),
+            "miniai.profiling._TimedLoader.__len__": ("15d-profiling.html#_timedloader.__len__", "miniai/profiling.py"),
+        },
+        "miniai.streaming": {
+            "miniai.streaming.StreamingDataset": ("15i-streaming.html#streamingdataset", "miniai/streaming.py"),
+            "miniai.streaming.StreamingDataset.__init__": (
+                "15i-streaming.html#streamingdataset.__init__",
+                "miniai/streaming.py",
+            ),
+            "miniai.streaming.StreamingDataset.__iter__": (
+                "15i-streaming.html#streamingdataset.__iter__",
+                "miniai/streaming.py",
+            ),
+            "miniai.streaming.StreamingDataset._chunks": (
+                "15i-streaming.html#streamingdataset._chunks",
+                "miniai/streaming.py",
+            ),
+            "miniai.streaming.StreamingDataset._parts": (
+                "15i-streaming.html#streamingdataset._parts",
+                "miniai/streaming.py",
+            ),
+            "miniai.streaming.StreamingDataset._read": (
+                "15i-streaming.html#streamingdataset._read",
+                "miniai/streaming.py",
+            ),
+            "miniai.streaming._batched": ("15i-streaming.html#_batched", "miniai/streaming.py"),
+            "miniai.streaming._cat": ("15i-streaming.html#_cat", "miniai/streaming.py"),
+            "miniai.streaming._is_parquet": ("15i-streaming.html#_is_parquet", "miniai/streaming.py"),
+            "miniai.streaming._shard": ("15i-streaming.html#_shard", "miniai/streaming.py"),
+            "miniai.streaming._shuffled": ("15i-streaming.html#_shuffled", "miniai/streaming.py"),
+            "miniai.streaming._split": ("15i-streaming.html#_split", "miniai/streaming.py"),
+        },
+        "miniai.telemetry": {
+            "miniai.telemetry.TelemetryCB": ("15k-telemetry.html#telemetrycb", "miniai/telemetry.py"),
+            "miniai.telemetry.TelemetryCB.__init__": ("15k-telemetry.html#telemetrycb.__init__", "miniai/telemetry.py"),
+            "miniai.telemetry.TelemetryCB._log_stats": (
+                "15k-telemetry.html#telemetrycb._log_stats",
+                "miniai/telemetry.py",
+            ),
+            "miniai.telemetry.TelemetryCB.after_batch": (
+                "15k-telemetry.html#telemetrycb.after_batch",
+                "miniai/telemetry.py",
+            ),
+            "miniai.telemetry.TelemetryCB.after_epoch": (
+                "15k-telemetry.html#telemetrycb.after_epoch",
+                "miniai/telemetry.py",
+            ),
+            "miniai.telemetry.TelemetryCB.before_fit": (
+                "15k-telemetry.html#telemetrycb.before_fit",
+                "miniai/telemetry.py",
+            ),
+            "miniai.telemetry.TelemetryCB.cleanup_fit": (
+                "15k-telemetry.html#telemetrycb.cleanup_fit",
+                "miniai/telemetry.py",
+            ),
+            "miniai.telemetry.TelemetrySink": ("15k-telemetry.html#telemetrysink", "miniai/telemetry.py"),
+            "miniai.telemetry.TelemetrySink.__init__": (
+                "15k-telemetry.html#telemetrysink.__init__",
+                "miniai/telemetry.py",
+            ),
+            "miniai.telemetry.TelemetrySink._flush": ("15k-telemetry.html#telemetrysink._flush", "miniai/telemetry.py"),
+            "miniai.telemetry.TelemetrySink._raise": ("15k-telemetry.html#telemetrysink._raise", "miniai/telemetry.py"),
+            "miniai.telemetry.TelemetrySink._run": ("15k-telemetry.html#telemetrysink._run", "miniai/telemetry.py"),
+            "miniai.telemetry.TelemetrySink._write": ("15k-telemetry.html#telemetrysink._write", "miniai/telemetry.py"),
+            "miniai.telemetry.TelemetrySink.flush": ("15k-telemetry.html#telemetrysink.flush", "miniai/telemetry.py"),
+            "miniai.telemetry.TelemetrySink.last": ("15k-telemetry.html#telemetrysink.last", "miniai/telemetry.py"),
+            "miniai.telemetry.TelemetrySink.log": ("15k-telemetry.html#telemetrysink.log", "miniai/telemetry.py"),
+            "miniai.telemetry._chunks": ("15k-telemetry.html#_chunks", "miniai/telemetry.py"),
+            "miniai.telemetry._histories": ("15k-telemetry.html#_histories", "miniai/telemetry.py"),
+            "miniai.telemetry._to_numpy": ("15k-telemetry.html#_to_numpy", "miniai/telemetry.py"),
+            "miniai.telemetry.load_telemetry": ("15k-telemetry.html#load_telemetry", "miniai/telemetry.py"),
+        },
+        "miniai.text": {
+            "miniai.text.BucketBatchSampler": ("15j-text.html#bucketbatchsampler", "miniai/text.py"),
+            "miniai.text.BucketBatchSampler.__init__": ("15j-text.html#bucketbatchsampler.__init__", "miniai/text.py"),
+            "miniai.text.BucketBatchSampler.__iter__": ("15j-text.html#bucketbatchsampler.__iter__", "miniai/text.py"),
+            "miniai.text.BucketBatchSampler.__len__": ("15j-text.html#bucketbatchsampler.__len__", "miniai/text.py"),
+            "miniai.text.BucketBatchSampler._batches": ("15j-text.html#bucketbatchsampler._batches", "miniai/text.py"),
+            "miniai.text.BucketBatchSampler.from_dataset": (
+                "15j-text.html#bucketbatchsampler.from_dataset",
+                "miniai/text.py",
+            ),
+            "miniai.text._is_seq": ("15j-text.html#_is_seq", "miniai/text.py"),
+            "miniai.text._pad": ("15j-text.html#_pad", "miniai/text.py"),
+            "miniai.text.collate_pad": ("15j-text.html#collate_pad", "miniai/text.py"),
+            "miniai.text.padding_stats": ("15j-text.html#padding_stats", "miniai/text.py"),
+            "miniai.text.seq_lengths": ("15j-text.html#seq_lengths", "miniai/text.py"),
         },
         "miniai.training": {
             "miniai.training.Dataset": ("14-minibatch-training.html#dataset", "miniai/training.py"),
@@ -146,7 +699,16 @@ d = {
             ),
             "miniai.training.Dataset.__init__": ("14-minibatch-training.html#dataset.__init__", "miniai/training.py"),
             "miniai.training.Dataset.__len__": ("14-minibatch-training.html#dataset.__len__", "miniai/training.py"),
+            "miniai.training.TensorBatchSampler": (
+                "14-minibatch-training.html#tensorbatchsampler",
+                "miniai/training.py",
+            ),
+            "miniai.training.TensorBatchSampler.__iter__": (
+                "14-minibatch-training.html#tensorbatchsampler.__iter__",
+                "miniai/training.py",
+            ),
             "miniai.training.accuracy": ("14-minibatch-training.html#accuracy", "miniai/training.py"),
+            "miniai.training.batch_dl": ("14-minibatch-training.html#batch_dl", "miniai/training.py"),
             "miniai.training.fit": ("14-minibatch-training.html#fit", "miniai/training.py"),
             "miniai.training.get_dls": ("14-minibatch-training.html#get_dls", "miniai/training.py"),
         },
@@ -3,18 +3,26 @@
 # %% auto 0
 __all__ = [
     "set_seed",
+    "deterministic",
+    "DeterministicCB",
     "Hook",
     "Hooks",
     "HooksCB",
+    "StatsHistory",
+    "ActStats",
     "append_stats",
     "get_stats_hist",
     "get_stats_hist_min",
     "ActivationStatsCB",
+    "ParamStats",
+    "ParamStatsCB",
 ]
 
 # %% ../15-activations.ipynb 1
+import os
 import random
 from functools import partial
+from contextlib import contextmanager
 
 import numpy as np
 
@@ -30,35 +38,97 @@ import matplotlib.pyplot as plt
 
 # %% ../15-activations.ipynb 7
 def set_seed(seed):
-    """Set our system up to run in a deterministic matter"""
-    torch.use_deterministic_algorithms(True)
+    """Seed all of the random number generators, use `deterministic` to make pytorch's algorithms repeatable too."""
     torch.manual_seed(seed)
     random.seed(seed)
     np.random.seed(seed)
 
 
-# %% ../15-activations.ipynb 24
+@contextmanager
+def deterministic(enabled=True, warn_only=False):
+    """Only use deterministic algorithms inside the with block, putting the previous settings back afterwards."""
+    prev = (
+        torch.are_deterministic_algorithms_enabled(),
+        torch.is_deterministic_algorithms_warn_only_enabled(),
+    )
+    cudnn = torch.backends.cudnn.deterministic, torch.backends.cudnn.benchmark
+    cublas = os.environ.get("CUBLAS_WORKSPACE_CONFIG")
+    # cuBLAS is only deterministic with a fixed size workspace
+    if enabled and cublas is None:
+        os.environ["CUBLAS_WORKSPACE_CONFIG"] = ":4096:8"
+
+    torch.use_deterministic_algorithms(enabled, warn_only=warn_only)
+    # Benchmarking picks whichever convolution algorithm is fastest, which can change from run to run
+    torch.backends.cudnn.deterministic, torch.backends.cudnn.benchmark = (
+        enabled,
+        cudnn[1] and not enabled,
+    )
+    try:
+        yield
+    finally:
+        torch.use_deterministic_algorithms(prev[0], warn_only=prev[1])
+        torch.backends.cudnn.deterministic, torch.backends.cudnn.benchmark = cudnn
+        if cublas is None:
+            os.environ.pop("CUBLAS_WORKSPACE_CONFIG", None)
+
+
+class DeterministicCB(ln.Callback):
+    """Runs the fit with deterministic algorithms, seeding the RNGs first if given a seed."""
+
+    order = -1
+
+    def __init__(self, seed=None, warn_only=False):
+        fc.store_attr()
+        self.ctx = None
+
+    def before_fit(self):
+        self.ctx = deterministic(warn_only=self.warn_only)
+        self.ctx.__enter__()
+        if self.seed is not None:
+            set_seed(self.seed)
+
+    def cleanup_fit(self):
+        if self.ctx is not None:
+            self.ctx.__exit__(None, None, None)
+            self.ctx = None
+
+
+# %% ../15-activations.ipynb 25
 class Hook:
     """
-    Registers a hook function on a model's forward pass.
+    Registers a hook function on a model's forward pass, or backward pass.
+    It can be removed and attached again, keeping anything the hook function stored on it.
     """
 
-    def __init__(self, module, hook_fn):
-        self.hook = module.register_forward_hook(partial(hook_fn, self))
+    def __init__(self, module, hook_fn, backward=False):
+        self.module, self.hook_fn, self.backward, self.hook = (
+            module,
+            partial(hook_fn, self),
+            backward,
+            None,
+        )
+        self.attach()
+
+    def attach(self):
+        if self.hook is None:
+            register = self.module.register_full_backward_hook if self.backward else self.module.register_forward_hook
+            self.hook = register(self.hook_fn)
 
     def remove(self):
-        self.hook.remove()
+        if self.hook is not None:
+            self.hook.remove()
+            self.hook = None
 
     def __del__(self):
         self.remove()
 
 
-# %% ../15-activations.ipynb 28
+# %% ../15-activations.ipynb 29
 class Hooks(list):
     """Registers a hook function with a list of modules and manages their lifetime as a context manager."""
 
-    def __init__(self, modules, hook_fn):
-        super().__init__([Hook(module, hook_fn) for module in modules])
+    def __init__(self, modules, hook_fn, backward=False):
+        super().__init__([Hook(module, hook_fn, backward) for module in modules])
 
     def __enter__(self, *args):
         return self
@@ -73,27 +143,66 @@ class Hooks(list):
         self[idx].remove()
         super().__delitem__(idx)
 
+    def attach(self):
+        for hook in self:
+            hook.attach()
+
     def remove(self):
         for hook in self:
             hook.remove()
 
 
-# %% ../15-activations.ipynb 31
+# %% ../15-activations.ipynb 32
 class HooksCB(ln.Callback):
-    def __init__(self, hook_fn, mod_filter=fc.noop, on_train=True, on_valid=False):
+    """
+    Hooks hook_fn into the forward (or backward) pass of modules that pass mod_filter, when training and/or validating.
+    It can only run every `every` batches, during some `epochs` or for the `first` so many batches,
+    the rest of the time the hooks are removed so they cost nothing.
+    """
+
+    def __init__(
+        self,
+        hook_fn,
+        mod_filter=fc.noop,
+        on_train=True,
+        on_valid=False,
+        every=1,
+        epochs=None,
+        first=None,
+        on_backward=False,
+    ):
         fc.store_attr()
         super().__init__()
 
     def before_fit(self):
         mods = fc.filter_ex(self.learn.model.modules(), self.mod_filter)
-        self.hooks = Hooks(mods, self._hook_fn)
-
-    def after_fit(self):
+        self.hooks = self._hooks(list(mods))
+        self.hooks.remove()
+        # Batches are counted separately for training and validation
+        self.counts = {True: 0, False: 0}
+
+    def before_batch(self):
+        if self._active():
+            self.hooks.attach()
+        else:
+            self.hooks.remove()
+
+    def _active(self):
+        training = self.learn.model.training
+        if not (self.on_train if training else self.on_valid):
+            return False
+        if self.epochs is not None and self.learn.epoch not in self.epochs:
+            return False
+
+        n = self.counts[training]
+        self.counts[training] += 1
+        return n % self.every == 0 and (self.first is None or n < self.first)
+
+    def _hooks(self, mods):
+        return Hooks(mods, self.hook_fn, self.on_backward)
+
+    def cleanup_fit(self):
         self.hooks.remove()
-
-    def _hook_fn(self, *args, **kwargs):
-        if (self.on_train and self.learn.model.training) or (self.on_valid and not self.learn.model.training):
-            self.hook_fn(*args, *kwargs)
 
     def __iter__(self):
         return iter(self.hooks)
@@ -102,40 +211,111 @@ class HooksCB(ln.Callback):
         return len(self.hooks)
 
 
-# %% ../15-activations.ipynb 34
-def append_stats(hook, mod, inp, out):
-    """Hook function to gets stats (mean, std dev, histogram of abs values) on fwd pass."""
+# %% ../15-activations.ipynb 36
+class StatsHistory:
+    """
+    A history of stats kept on their device in buffers allocated up front. Once they're full every other entry
+    is dropped and we record half as often, so the history always covers the whole fit.
+    Indexing gives a stat's history on the cpu, like a tuple of lists.
+    """
+
+    names = None
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.buffers, self.n, self.step, self.stride = None, 0, 0, 1
+        # How many entries have ever been recorded, downsampling doesn't change this
+        self.total = 0
+
+    def due(self):
+        """Whether to record the stats for this step, call it once for each step."""
+        self.step += 1
+        return (self.step - 1) % self.stride == 0
+
+    def append(self, *stats):
+        """Record some tensors of stats, copying them into the buffers on their device without waiting for them."""
+        if self.buffers is None:
+            self.buffers = [torch.empty(self.capacity, *o.shape, device=o.device) for o in stats]
+        if self.n == self.capacity:
+            self._downsample()
+
+        for buf, o in zip(self.buffers, stats):
+            buf[self.n] = o
+        self.n += 1
+        self.total += 1
+
+    def last(self):
+        """Copies of the latest entry's stats, still on their device (the buffers get overwritten as we go)."""
+        return [buf[self.n - 1].clone() for buf in self.buffers]
+
+    def _downsample(self):
+        half = self.capacity // 2
+        for buf in self.buffers:
+            buf[:half] = buf[: 2 * half : 2].clone()
+        self.n, self.stride = half, self.stride * 2
+
+    @property
+    def steps(self):
+        """The step each entry was recorded at."""
+        return torch.arange(self.n) * self.stride
+
+    def __getitem__(self, i):
+        if self.buffers is None:
+            return torch.empty(0)
+        return self.buffers[i][: self.n].cpu()
+
+    def __len__(self):
+        return 0 if self.buffers is None else len(self.buffers)
+
+
+class ActStats(StatsHistory):
+    """The `StatsHistory` of the means, std devs and histograms of abs values of a module's activations."""
+
+    names = ["mean", "std", "hist"]
+
+    def __init__(self, capacity=4096, bins=40, max_val=10):
+        super().__init__(capacity)
+        self.bins, self.max_val = bins, max_val
+
+    def add(self, acts):
+        if not self.due():
+            return
+
+        acts = acts.detach().float()
+        self.append(acts.mean(), acts.std(), acts.abs().histc(self.bins, 0, self.max_val))
+
+
+def append_stats(hook, mod, inp, out, capacity=4096, max_val=10):
+    """Hook function to gets stats (mean, std dev, histogram of abs values) on fwd pass, or of the grads on bwd pass."""
     if not hasattr(hook, "stats"):
-        hook.stats = ([], [], [])
+        hook.stats = ActStats(capacity, max_val=max_val)
 
-    acts = ln.to_cpu(out)
-    hook.stats[0].append(acts.mean())
-    hook.stats[1].append(acts.std())
-    hook.stats[2].append(acts.abs().histc(40, 0, 10))
+    # Backward hooks get a tuple of the grads of the outputs
+    hook.stats.add(out[0] if isinstance(out, tuple) else out)
 
 
-# %% ../15-activations.ipynb 36
+# %% ../15-activations.ipynb 38
 def get_stats_hist(stats_hook):
     """Get histogram in a suitable format for an image"""
-    return torch.stack(stats_hook.stats[2]).t().float().log1p()
+    return stats_hook.stats[2].t().float().log1p()
 
 
 def get_stats_hist_min(stats_hook):
     """Get histogram in a suitable format for an image, looking at the smallest equally sized group."""
-    hist = torch.stack(stats_hook.stats[2]).t().float()
+    hist = stats_hook.stats[2].t().float()
     return hist[0] / hist.sum(0)
 
 
-# %% ../15-activations.ipynb 40
+# %% ../15-activations.ipynb 42
 class ActivationStatsCB(HooksCB):
-    def __init__(self, mod_filter=fc.noop):
-        super().__init__(append_stats, mod_filter)
+    def __init__(self, mod_filter=fc.noop, capacity=4096, max_val=10, **kwargs):
+        super().__init__(partial(append_stats, capacity=capacity, max_val=max_val), mod_filter, **kwargs)
 
     def plot_stats(self, figsize=(10, 4)):
         fig, axes = plt.subplots(1, 2, figsize=figsize)
         for hook in self:
             for stat_idx in [0, 1]:
-                axes[stat_idx].plot(hook.stats[stat_idx])
+                axes[stat_idx].plot(hook.stats.steps, hook.stats[stat_idx])
 
         axes[0].set_title("Means")
         axes[1].set_title("Std devs")
@@ -151,3 +331,126 @@ class ActivationStatsCB(HooksCB):
         for axis, hist in zip(axes.flatten(), self):
             axis.plot(get_stats_hist_min(hist))
             axis.set_ylim(0, 1)
+
+
+# %% ../15-activations.ipynb 51
+class ParamStats:
+    """
+    Records per layer stats of the parameters of some modules before and after each step of opt, computed for all the
+    parameters at once on their device. `attach` and `remove` add and remove the hooks on the optimizer,
+    and the buffers the stats are computed in are only kept while attached.
+    """
+
+    names = ["param_norm", "grad_norm", "grad_mean", "grad_std", "update_ratio"]
+
+    def __init__(self, opt, modules, capacity=4096):
+        layers = [[p for p in mod.parameters(recurse=False) if p.requires_grad] for mod in modules]
+        self.layers = [i for i, ps in enumerate(layers) if ps]
+        layers = [layers[i] for i in self.layers]
+        self.params = [p for ps in layers for p in ps]
+
+        # Which layer each param belongs to, and how many values each layer has
+        self.layer_idx = torch.tensor([i for i, ps in enumerate(layers) for _ in ps])
+        self.lengths = torch.tensor([sum(p.numel() for p in ps) for ps in layers])
+
+        self.history = StatsHistory(capacity)
+        self.history.names = self.names
+        self.opt, self.handles, self.pending = opt, None, False
+
+    def attach(self):
+        if self.handles is None and self.params:
+            self._alloc()
+            self.handles = [
+                self.opt.register_step_pre_hook(self._before_step),
+                self.opt.register_step_post_hook(self._after_step),
+            ]
+
+    def _alloc(self):
+        """Make the buffers on the params' device, the grads are copied into one flat buffer laid out layer by layer."""
+        device = self.params[0].device
+        self.layer_idx, self.lengths = self.layer_idx.to(device), self.lengths.to(device)
+        self.flat = torch.empty(int(self.lengths.sum()), device=device)
+        views = self.flat.split([p.numel() for p in self.params])
+        self.flat_grads = [view.view_as(p) for view, p in zip(views, self.params)]
+        self.prev = [torch.empty_like(p) for p in self.params]
+
+    def remove(self):
+        if self.handles is not None:
+            for handle in self.handles:
+                handle.remove()
+            self.handles = None
+            self.flat = self.flat_grads = self.prev = None
+            self.pending = False
+
+    def _layer_norms(self, tensors):
+        """The norm of each layer's tensors."""
+        sq = torch.stack(torch._foreach_norm(tensors)).float().square()
+        return torch.zeros(len(self.lengths), device=sq.device).index_add_(0, self.layer_idx, sq).sqrt()
+
+    @torch.no_grad()
+    def _before_step(self, opt, args, kwargs):
+        if not self.history.due():
+            return
+
+        grads = [p.grad for p in self.params]
+        if any(g is None for g in grads):
+            # Params that didn't get a grad count as zeros
+            for buf, g in zip(self.flat_grads, grads):
+                buf.zero_() if g is None else buf.copy_(g)
+        else:
+            torch._foreach_copy_(self.flat_grads, grads)
+
+        grad_norm = self._layer_norms(self.flat_grads)
+        # There's no _foreach sum, so each layer is summed over its segment of the flat buffer
+        mean = torch.segment_reduce(self.flat, "sum", lengths=self.lengths) / self.lengths
+        std = (grad_norm.square() / self.lengths - mean.square()).clamp_min(0).sqrt()
+
+        self.grad_stats = grad_norm, mean, std
+        torch._foreach_copy_(self.prev, self.params)
+        self.pending = True
+
+    @torch.no_grad()
+    def _after_step(self, opt, args, kwargs):
+        if not self.pending:
+            return
+
+        param_norm = self._layer_norms(self.params)
+        torch._foreach_sub_(self.prev, self.params)
+        update_norm = self._layer_norms(self.prev)
+        self.pending = False
+        self.history.append(param_norm, *self.grad_stats, update_norm / param_norm)
+
+    def __getitem__(self, name):
+        """The history of one of the stats in `names` on the cpu, with a column for each layer."""
+        return self.history[self.names.index(name)]
+
+
+class ParamStatsCB(HooksCB):
+    """Records `ParamStats` for the layers that pass mod_filter, with the same scheduling as `HooksCB`."""
+
+    # After the DeviceCB so the layer indices are made on the same device as the params
+    order = ln.DeviceCB.order + 1
+
+    def __init__(self, mod_filter=fc.noop, capacity=4096, **kwargs):
+        super().__init__(None, mod_filter, **kwargs)
+        self.capacity = capacity
+
+    def _hooks(self, mods):
+        res = ParamStats(self.learn.opt, mods, self.capacity)
+        names = {id(mod): name for name, mod in self.learn.model.named_modules()}
+        self.layer_names = [names[id(mods[i])] for i in res.layers]
+        return res
+
+    @property
+    def stats(self):
+        return self.hooks
+
+    def plot_stats(self, figsize=(15, 3)):
+        fig, axes = plt.subplots(1, len(ParamStats.names), figsize=figsize)
+        for axis, name in zip(axes, ParamStats.names):
+            axis.plot(self.stats.history.steps, self.stats[name])
+            axis.set_title(name)
+            if name != "grad_mean":
+                axis.set_yscale("log")
+
+        plt.legend(self.layer_names)
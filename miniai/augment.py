@@ -0,0 +1,100 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../15h-augmentation.ipynb.
+
+# %% auto 0
+__all__ = ["RandomFlip", "RandomCrop", "RandomNoise", "Normalize", "BatchTransformCB"]
+
+# %% ../15h-augmentation.ipynb 1
+import torch
+from torch import nn
+import torch.nn.functional as F
+
+import fastcore.all as fc
+
+import miniai.learner as ln
+
+
+# %% ../15h-augmentation.ipynb 8
+def _per_item(t, x):
+    """Puts a tensor with one value per item in x onto its device, shaped to broadcast against it."""
+    return t.to(x.device).view(-1, *[1] * (x.ndim - 1))
+
+
+class RandomFlip(nn.Module):
+    """Flips each image along dim with probability p."""
+
+    def __init__(self, p=0.5, dim=-1):
+        super().__init__()
+        self.p, self.dim = p, dim
+
+    def forward(self, x):
+        flip = _per_item(torch.rand(len(x)) < self.p, x)
+        return torch.where(flip, x.flip(self.dim), x)
+
+
+class RandomCrop(nn.Module):
+    """Crops a random size patch out of each image, after padding them by padding pixels of fill on each side."""
+
+    def __init__(self, size, padding=0, fill=0.0):
+        super().__init__()
+        self.size = (size, size) if isinstance(size, int) else tuple(size)
+        self.padding, self.fill = padding, fill
+
+    def forward(self, x):
+        if self.padding:
+            x = F.pad(x, [self.padding] * 4, value=self.fill)
+
+        (n, c, h, w), (ch, cw) = x.shape, self.size
+        top, left = torch.randint(0, h - ch + 1, (n,)), torch.randint(0, w - cw + 1, (n,))
+
+        # Index every image with its own rows and columns in one go
+        def _idx(start, size):
+            return start.to(x.device)[:, None] + torch.arange(size, device=x.device)
+
+        rows, cols = _idx(top, ch), _idx(left, cw)
+        return x[
+            torch.arange(n, device=x.device)[:, None, None, None],
+            torch.arange(c, device=x.device)[None, :, None, None],
+            rows[:, None, :, None],
+            cols[:, None, None, :],
+        ]
+
+
+class RandomNoise(nn.Module):
+    """Adds gaussian noise to each image, with a standard deviation picked uniformly between 0 and std."""
+
+    def __init__(self, std=0.1):
+        super().__init__()
+        self.std = std
+
+    def forward(self, x):
+        std = _per_item(torch.rand(len(x)) * self.std, x)
+        return x + torch.randn_like(x) * std
+
+
+class Normalize(nn.Module):
+    """Normalizes a batch with the mean and std of the dataset, either one value each or one per channel."""
+
+    def __init__(self, mean, std):
+        super().__init__()
+        self.mean, self.std = [torch.as_tensor(o, dtype=torch.float32) for o in (mean, std)]
+
+    def forward(self, x):
+        mean, std = [o.to(x.device, x.dtype).view(-1, 1, 1) if o.ndim else o for o in (self.mean, self.std)]
+        return (x - mean) / std
+
+
+# %% ../15h-augmentation.ipynb 14
+class BatchTransformCB(ln.Callback):
+    """Applies tfm to the inputs of each batch, when training and/or validating."""
+
+    # After the DeviceCB has put the batch on the device
+    order = ln.DeviceCB.order + 1
+    inference = True
+
+    def __init__(self, tfm, on_train=True, on_valid=False):
+        fc.store_attr()
+
+    def before_batch(self):
+        if (self.on_train and self.learn.model.training) or (self.on_valid and not self.learn.model.training):
+            xb, *rest = self.learn.batch
+            self.learn.batch = (self.tfm(xb), *rest)
@@ -0,0 +1,325 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../15f-benchmarks.ipynb.
+
+# %% auto 0
+__all__ = [
+    "benchmarks",
+    "synthetic_data",
+    "synthetic_dls",
+    "mlp",
+    "conv_model",
+    "StepTimerCB",
+    "summarise",
+    "bench_learner",
+    "bench_training_fit",
+    "bench_train_cb",
+    "bench_momentum_learner",
+    "bench_conv",
+    "bench_callback_overhead",
+    "synthetic_hf_dataset",
+    "bench_collate",
+    "bench_show_images",
+    "run_benchmarks",
+    "compare",
+    "main",
+]
+
+# %% ../15f-benchmarks.ipynb 1
+import io
+import json
+import time
+import platform
+import subprocess
+from pathlib import Path
+from statistics import mean, median
+from contextlib import redirect_stdout
+
+import torch
+from torch import nn, optim
+import torch.nn.functional as F
+from torch.utils.data import DataLoader, default_collate
+
+from fastcore.script import call_parse
+
+import miniai.datasets as ds
+import miniai.conv as cv
+import miniai.training as tr
+import miniai.learner as ln
+
+
+# %% ../15f-benchmarks.ipynb 4
+def synthetic_data(n, shape=(784,), n_classes=10, seed=42):
+    """Random inputs of shape and random integer targets."""
+    gen = torch.Generator().manual_seed(seed)
+    return torch.randn(n, *shape, generator=gen), torch.randint(0, n_classes, (n,), generator=gen)
+
+
+def synthetic_dls(n=4096, shape=(784,), batch_size=64, **kwargs):
+    """Random `DataLoaders`, the validation set is a quarter of the size of the training set."""
+    train_ds, valid_ds = tr.Dataset(*synthetic_data(n, shape)), tr.Dataset(*synthetic_data(n // 4, shape, seed=43))
+    return ln.DataLoaders(*tr.get_dls(train_ds, valid_ds, batch_size, **kwargs))
+
+
+def mlp(n_in=784, n_hidden=50, n_out=10):
+    return nn.Sequential(nn.Linear(n_in, n_hidden), nn.ReLU(), nn.Linear(n_hidden, n_out))
+
+
+def conv_model(channels=(8, 16, 32, 64)):
+    """A stack of `cv.conv`s that takes a 1x28x28 image down to 10 outputs."""
+    chans = (1,) + tuple(channels)
+    layers = [cv.conv(c_in, c_out) for c_in, c_out in zip(chans, chans[1:])]
+    return nn.Sequential(*layers, cv.conv(chans[-1], 10, act=False), nn.Flatten())
+
+
+# %% ../15f-benchmarks.ipynb 6
+class StepTimerCB(ln.Callback):
+    """Records the time taken and the number of samples in each training batch."""
+
+    def before_fit(self):
+        self.times, self.sizes = [], []
+        # Time the learner's whole one_batch, so every callback's before_batch and after_batch is included
+        self.one_batch = self.learn.one_batch
+        self.learn.one_batch = self._timed_batch
+
+    def _timed_batch(self):
+        start = time.perf_counter()
+        self.one_batch()
+        if self.learn.model.training:
+            self.times.append(time.perf_counter() - start)
+            self.sizes.append(len(self.learn.batch[0]))
+
+    def cleanup_fit(self):
+        self.learn.__dict__.pop("one_batch", None)
+
+
+def summarise(times, sizes, warmup=5):
+    """Throughput and latency stats from per step times, skipping the warmup steps."""
+    times, sizes = times[warmup:], sizes[warmup:]
+    return {
+        "steps": len(times),
+        "samples_per_sec": sum(sizes) / sum(times),
+        "step_ms_mean": 1000 * mean(times),
+        "step_ms_p50": 1000 * median(times),
+        "step_ms_p90": 1000 * sorted(times)[int(0.9 * (len(times) - 1))],
+    }
+
+
+def bench_learner(learner_cls, model, dls, cbs=(), lr=0.1, epochs=1, warmup=5, **kwargs):
+    """Fit a learner with a `StepTimerCB` and summarise the training steps."""
+    timer = StepTimerCB()
+    learn = learner_cls(model, dls, F.cross_entropy, lr, [timer, *cbs], **kwargs)
+    learn.fit(epochs)
+    return summarise(timer.times, timer.sizes, warmup)
+
+
+# %% ../15f-benchmarks.ipynb 8
+def bench_training_fit(n=4096, batch_size=64, epochs=1):
+    """The original `training.fit` loop, it's only timed as a whole so the step time is the average."""
+    dls = synthetic_dls(n, batch_size=batch_size)
+    model = mlp()
+    opt = optim.SGD(model.parameters(), lr=0.1)
+
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        tr.fit(epochs, model, F.cross_entropy, opt, dls.train, dls.valid)
+    elapsed = time.perf_counter() - start
+
+    # fit trains and then validates on train_dl so sees every sample twice
+    steps = 2 * epochs * len(dls.train)
+    return {
+        "steps": steps,
+        "samples_per_sec": 2 * epochs * n / elapsed,
+        "step_ms_mean": 1000 * elapsed / steps,
+    }
+
+
+def bench_train_cb(n=4096, batch_size=64):
+    return bench_learner(ln.Learner, mlp(), synthetic_dls(n, batch_size=batch_size), [ln.TrainCB()])
+
+
+def bench_momentum_learner(n=4096, batch_size=64):
+    return bench_learner(ln.MomentumLearner, mlp(), synthetic_dls(n, batch_size=batch_size))
+
+
+def bench_conv(n=2048, batch_size=64, channels=(8, 16, 32, 64)):
+    dls = synthetic_dls(n, shape=(1, 28, 28), batch_size=batch_size)
+    return bench_learner(ln.Learner, conv_model(channels), dls, [ln.TrainCB()])
+
+
+class _NoopCB(ln.Callback):
+    def before_batch(self):
+        pass
+
+    def after_batch(self):
+        pass
+
+
+def bench_callback_overhead(n_cbs=(0, 5, 10, 20, 40), n=4096, batch_size=64):
+    """How the step time of a small model grows as we add callbacks that do nothing."""
+    dls = synthetic_dls(n, batch_size=batch_size)
+    res = {}
+    for k in n_cbs:
+        cbs = [ln.TrainCB()] + [_NoopCB() for _ in range(k)]
+        res[str(k)] = bench_learner(ln.Learner, mlp(), dls, cbs)
+
+    return res
+
+
+# %% ../15f-benchmarks.ipynb 10
+def synthetic_hf_dataset(n=4096, shape=(784,)):
+    """A Hugging Face dataset with `image` and `label` columns, formatted as torch tensors."""
+    from datasets import Dataset
+
+    x, y = synthetic_data(n, shape)
+    return Dataset.from_dict({"image": x.numpy(), "label": y.numpy()}).with_format("torch")
+
+
+def bench_collate(n=4096, batch_size=64, warmup=5):
+    """Time iterating through a dataloader with `collate_dict`, `default_collate` and a `ColumnarDataset`."""
+    dset = synthetic_hf_dataset(n)
+    cols = ds.ColumnarDataset(dset.with_format(None))
+    res = {}
+    for name, d, collate_fn in (
+        ("collate_dict", dset, ds.collate_dict(dset)),
+        ("default_collate", dset, default_collate),
+        ("collate_columns", cols, ds.collate_columns(cols)),
+    ):
+        times, sizes = [], []
+        it = iter(DataLoader(d, batch_size, collate_fn=collate_fn))
+        while True:
+            start = time.perf_counter()
+            batch = next(it, None)
+            if batch is None:
+                break
+            times.append(time.perf_counter() - start)
+            sizes.append(batch_size)
+
+        res[name] = summarise(times, sizes, warmup)
+
+    return res
+
+
+# %% ../15f-benchmarks.ipynb 12
+def bench_show_images(n=256, shape=(1, 28, 28), steps=3, warmup=1):
+    """Time drawing `n` images with `show_images` and with `show_montage`."""
+    import matplotlib.pyplot as plt
+
+    ims = torch.rand(n, *shape, generator=torch.Generator().manual_seed(42))
+    res = {}
+    for name, show in (
+        ("show_images", ds.show_images),
+        ("show_montage", ds.show_montage),
+    ):
+        times = []
+        for _ in range(warmup + steps):
+            start = time.perf_counter()
+            show(ims, imsize=0.5)
+            plt.gcf().canvas.draw()
+            times.append(time.perf_counter() - start)
+            plt.close("all")
+        res[name] = summarise(times, [n] * len(times), warmup)
+
+    return res
+
+
+# %% ../15f-benchmarks.ipynb 15
+benchmarks = {
+    "training_fit": bench_training_fit,
+    "learner_train_cb": bench_train_cb,
+    "momentum_learner": bench_momentum_learner,
+    "conv": bench_conv,
+    "collate": bench_collate,
+    "callback_overhead": bench_callback_overhead,
+    "show_images": bench_show_images,
+}
+
+
+def _median_run(runs):
+    """The run with the median samples per second, for benchmarks that return nested results do it per key."""
+    if "samples_per_sec" in runs[0]:
+        return sorted(runs, key=lambda o: o["samples_per_sec"])[len(runs) // 2]
+
+    return {k: _median_run([run[k] for run in runs]) for k in runs[0]}
+
+
+def _git_commit():
+    # Run git in the package's directory so we get miniai's commit
+    cwd = Path(ds.__file__).parent
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(only=None, repeats=3, threads=1, seed=42):
+    """Run the benchmarks returning the results and a description of where they were run."""
+    torch.set_num_threads(threads)
+    results = {}
+    for name, bench in benchmarks.items():
+        if only and name not in only:
+            continue
+
+        runs = []
+        for _ in range(repeats):
+            torch.manual_seed(seed)
+            runs.append(bench())
+        results[name] = _median_run(runs)
+
+    meta = {
+        "commit": _git_commit(),
+        "torch": torch.__version__,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "threads": threads,
+        "repeats": repeats,
+        "seed": seed,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    return {"meta": meta, "results": results}
+
+
+# %% ../15f-benchmarks.ipynb 18
+def _flatten(results, prefix=""):
+    res = {}
+    for k, v in results.items():
+        if "samples_per_sec" in v:
+            res[prefix + k] = v
+        else:
+            res.update(_flatten(v, f"{prefix}{k}/"))
+
+    return res
+
+
+def compare(base, new):
+    """Print the change in samples/sec for each benchmark between two result files (or dicts)."""
+    base, new = [json.load(open(o)) if isinstance(o, str) else o for o in (base, new)]
+    base, new = _flatten(base["results"]), _flatten(new["results"])
+
+    print(f"{'benchmark':<30} {'base':>12} {'new':>12} {'change':>8}")
+    for k in [k for k in base if k in new]:
+        b, n = base[k]["samples_per_sec"], new[k]["samples_per_sec"]
+        print(f"{k:<30} {b:>12.0f} {n:>12.0f} {100 * (n / b - 1):>+7.1f}%")
+
+
+# %% ../15f-benchmarks.ipynb 21
+@call_parse
+def main(
+    out: str = "bench.json",  # Where to write the results
+    only: str = None,  # Comma separated names of the benchmarks to run, defaults to all of them
+    repeats: int = 3,  # How many times to run each benchmark
+    threads: int = 1,  # Number of threads for torch to use
+    base: str = None,  # A previous results file to compare to
+):
+    "Run the miniai benchmarks and save the results as JSON"
+    res = run_benchmarks(only.split(",") if only else None, repeats, threads)
+    with open(out, "w") as f:
+        json.dump(res, f, indent=2)
+
+    if base is not None:
+        compare(base, res)
@@ -0,0 +1,296 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../15e-checkpoints.ipynb.
+
+# %% auto 0
+__all__ = [
+    "get_rng_state",
+    "set_rng_state",
+    "snapshot",
+    "AsyncSaver",
+    "latest_checkpoint",
+    "skip_batches",
+    "CheckpointCB",
+]
+
+# %% ../15e-checkpoints.ipynb 1
+import os
+import random
+import threading
+from pathlib import Path
+from queue import Queue
+from itertools import islice
+from collections.abc import Mapping
+
+import numpy as np
+
+import torch
+from torch.utils.data import DataLoader
+from torch.nn.parallel import DistributedDataParallel
+
+import fastcore.all as fc
+
+import miniai.training as tr
+import miniai.learner as ln
+
+
+# %% ../15e-checkpoints.ipynb 8
+def get_rng_state(generator=None):
+    """Get the state of all the RNGs that `set_seed` seeds, and of a dataloader's generator if it has one."""
+    state = {
+        "random": random.getstate(),
+        "numpy": np.random.get_state(),
+        "torch": torch.get_rng_state(),
+    }
+    if torch.cuda.is_available():
+        state["cuda"] = torch.cuda.get_rng_state_all()
+    if generator is not None:
+        state["generator"] = generator.get_state()
+
+    return state
+
+
+def set_rng_state(state, generator=None):
+    """Restore the RNGs from `get_rng_state`."""
+    random.setstate(state["random"])
+    np.random.set_state(state["numpy"])
+    torch.set_rng_state(state["torch"])
+    if "cuda" in state and torch.cuda.is_available():
+        torch.cuda.set_rng_state_all(state["cuda"])
+    if "generator" in state and generator is not None:
+        generator.set_state(state["generator"])
+
+
+# %% ../15e-checkpoints.ipynb 11
+def snapshot(obj):
+    """Copy all of the tensors in a (nested) state dict to the cpu so they wont change under us."""
+    if isinstance(obj, torch.Tensor):
+        return obj.detach().to("cpu", copy=True)
+    if isinstance(obj, Mapping):
+        return {k: snapshot(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(snapshot(o) for o in obj)
+
+    return obj
+
+
+class AsyncSaver:
+    """Saves checkpoints to `path` on a background thread, keeping the last `keep` of them."""
+
+    def __init__(self, path, keep=3, prefix="checkpoint"):
+        fc.store_attr()
+        self.path = Path(path)
+        self.queue, self.thread, self.error = Queue(), None, None
+
+    def save(self, state, step):
+        """Queue up a save of `state` (which should be a snapshot) as checkpoint number `step`."""
+        self._raise()
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+        self.queue.put((state, step))
+
+    def _run(self):
+        while True:
+            state, step = self.queue.get()
+            try:
+                self._write(state, step)
+            except Exception as e:
+                self.error = e
+            finally:
+                self.queue.task_done()
+
+    def _write(self, state, step):
+        self.path.mkdir(parents=True, exist_ok=True)
+        fname = self.path / f"{self.prefix}_{step:08d}.pt"
+        tmp = fname.with_suffix(".tmp")
+
+        # Save then rename so there's never a half written checkpoint
+        torch.save(state, tmp)
+        os.replace(tmp, fname)
+
+        for old in self.checkpoints()[: -self.keep]:
+            old.unlink()
+
+    def checkpoints(self):
+        """All of the checkpoints in path, oldest first."""
+        return sorted(self.path.glob(f"{self.prefix}_*.pt"))
+
+    def wait(self):
+        """Block until all the queued checkpoints are saved."""
+        self.queue.join()
+        self._raise()
+
+    def _raise(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+
+def latest_checkpoint(path, prefix="checkpoint"):
+    """The path of the newest checkpoint in path, or None."""
+    ckpts = sorted(Path(path).glob(f"{prefix}_*.pt"))
+    return ckpts[-1] if ckpts else None
+
+
+# %% ../15e-checkpoints.ipynb 13
+class _SkipBatchSampler:
+    """Drops the first n batches of indices from a batch sampler."""
+
+    def __init__(self, batch_sampler, n):
+        self.batch_sampler, self.n = batch_sampler, n
+
+    def __len__(self):
+        return max(len(self.batch_sampler) - self.n, 0)
+
+    def __iter__(self):
+        return islice(iter(self.batch_sampler), self.n, None)
+
+
+class _SkipLoader:
+    """Skips the first n batches of any iterable dataloader."""
+
+    def __init__(self, dl, n):
+        self.dl, self.n = dl, n
+
+    def __len__(self):
+        return max(len(self.dl) - self.n, 0)
+
+    def __iter__(self):
+        return islice(iter(self.dl), self.n, None)
+
+
+def skip_batches(dl, n):
+    """A version of dl that starts from the nth batch, without loading the first n batches if possible."""
+    if n == 0:
+        return dl
+
+    if isinstance(dl, DataLoader) and dl.batch_sampler is not None:
+        batches = {"batch_sampler": _SkipBatchSampler(dl.batch_sampler, n)}
+    elif isinstance(dl, DataLoader) and isinstance(dl.sampler, tr.TensorBatchSampler):
+        # Each of the sampler's tensors of indices is a whole batch
+        batches = {"batch_size": None, "sampler": _SkipBatchSampler(dl.sampler, n)}
+    else:
+        return _SkipLoader(dl, n)
+
+    return DataLoader(
+        dl.dataset,
+        **batches,
+        num_workers=dl.num_workers,
+        collate_fn=dl.collate_fn,
+        pin_memory=dl.pin_memory,
+        timeout=dl.timeout,
+        worker_init_fn=dl.worker_init_fn,
+        generator=dl.generator,
+        persistent_workers=dl.persistent_workers,
+        **({"prefetch_factor": dl.prefetch_factor} if dl.num_workers > 0 else {}),
+    )
+
+
+class CheckpointCB(ln.Callback):
+    """Saves checkpoints of the fit in the background, and resumes a fit from them."""
+
+    # Before anything (even the ProfileCB) wraps the training dataloader, so we can skip batches in its sampler.
+    # The checkpoint is loaded at the start of the first epoch, once the DeviceCB has moved the model
+    order = -20
+
+    def __init__(self, path, every=None, keep=3, resume=False):
+        fc.store_attr()
+        self.saver = AsyncSaver(path, keep)
+
+    def before_fit(self):
+        self.n_steps = 0
+        self.start_epoch, self.start_batch, self.resume_state = 0, 0, None
+        self.resume_from = None
+        if self.resume:
+            self.resume_from = latest_checkpoint(self.path) if self.resume is True else self.resume
+
+    @property
+    def generator(self):
+        """The training dataloader's own generator, if it's been `seeded`."""
+        return getattr(self.learn.dls.train, "generator", None)
+
+    def load(self, fname):
+        """Load a checkpoint into the learner, the fit will carry on from where it was saved."""
+        state = torch.load(fname, weights_only=False)
+        model = self.learn.model
+        if isinstance(model, DistributedDataParallel):
+            model = model.module
+        model.load_state_dict(state["model"])
+        self.learn.opt.load_state_dict(state["opt"])
+
+        # Learners like the MomentumLearner carry their grads over between batches
+        for param, grad in zip(self.learn.model.parameters(), state["grads"]):
+            param.grad = None if grad is None else grad.to(param.device)
+
+        self.n_steps = state["step"]
+        self.start_epoch, self.start_batch = state["epoch"], state["batch"]
+        self.resume_state = state
+
+    def before_epoch(self):
+        if self.resume_from is not None:
+            self.load(self.resume_from)
+            self.resume_from = None
+
+        if self.learn.epoch < self.start_epoch:
+            raise ln.CancelEpochException()
+
+        if not self.learn.model.training:
+            return
+
+        if self.resume_state is not None and self.learn.epoch == self.start_epoch:
+            # Replay the epoch's shuffle, skipping the batches we've already done
+            set_rng_state(self.resume_state["epoch_rng"], self.generator)
+            self.learn.dl = skip_batches(self.learn.dl, self.start_batch)
+            # Keep the batch numbers (and so when grad_accum steps) the same as the uninterrupted epoch
+            self.learn.batch_offset = self.start_batch
+        else:
+            self.resume_state = None
+
+        self.epoch_rng = get_rng_state(self.generator)
+
+    def before_batch(self):
+        # Once the dataloader has shuffled we can put the rest of the RNG state back,
+        # if we saved at the end of an epoch there's nothing more to restore
+        if self.resume_state is not None and self.learn.model.training:
+            if self.start_batch > 0:
+                set_rng_state(self.resume_state["rng"])
+            self.resume_state = None
+
+    def after_batch(self):
+        if not self.learn.model.training:
+            return
+
+        self.n_steps += 1
+        if self.every and self.n_steps % self.every == 0:
+            self.save(self.learn.epoch, self.learn.num + 1)
+
+    def after_epoch(self):
+        # Save once the validation is done so we resume at the start of the next epoch
+        if not self.learn.model.training:
+            self.epoch_rng = get_rng_state(self.generator)
+            self.save(self.learn.epoch + 1, 0)
+
+    def save(self, epoch, batch):
+        """Snapshot the current state and queue it up to be saved."""
+        # All the processes have the same weights when training distributed, so only rank 0 saves
+        if not ln.is_main_process():
+            return
+
+        model = self.learn.model
+        if isinstance(model, DistributedDataParallel):
+            model = model.module
+
+        state = {
+            "model": model.state_dict(),
+            "opt": self.learn.opt.state_dict(),
+            "grads": [param.grad for param in self.learn.model.parameters()],
+            "epoch": epoch,
+            "batch": batch,
+            "step": self.n_steps,
+            "rng": get_rng_state(),
+            "epoch_rng": self.epoch_rng,
+        }
+        self.saver.save(snapshot(state), self.n_steps)
+
+    def cleanup_fit(self):
+        self.saver.wait()
@@ -32,12 +32,12 @@ def conv(in_channels, out_channels, kernel_size=3, stride=2, act=True):
 def_device = "cuda" if torch.cuda.is_available() else "cpu"
 
 
-def to_device(x, device=def_device):
+def to_device(x, device=def_device, non_blocking=False):
     """Calls to_device on tensors,lists of tensors, dicts of tensors"""
     if isinstance(x, Mapping):
-        return {k: val.to(device) for k, val in x.items()}
+        return {k: val.to(device, non_blocking=non_blocking) for k, val in x.items()}
 
-    return type(x)(o.to(device) for o in x)
+    return type(x)(o.to(device, non_blocking=non_blocking) for o in x)
 
 
 def collate_device(batch):
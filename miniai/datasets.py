@@ -1,17 +1,46 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../14-huggingface-datasets.ipynb.
 
 # %% auto 0
-__all__ = ["inplace", "collate_dict", "show_image", "subplots", "get_grid", "show_images"]
+__all__ = [
+    "inplace",
+    "collate_dict",
+    "column_to_tensor",
+    "ColumnarDataset",
+    "collate_columns",
+    "MemmapDataset",
+    "materialize",
+    "show_image",
+    "subplots",
+    "get_grid",
+    "show_images",
+    "montage",
+    "show_montage",
+]
 
 # %% ../14-huggingface-datasets.ipynb 1
+import os
+import json
 import math
-from itertools import zip_longest
+import shutil
+import inspect
+from pathlib import Path
+from functools import partial
 from operator import itemgetter
 
+import warnings
+
 import numpy as np
+import pyarrow as pa
 import matplotlib.pyplot as plt
 import fastcore.all as fc
+import torch
+import torch.nn.functional as F
 from torch.utils.data import default_collate
+from datasets.fingerprint import Hasher
+from datasets.features.features import require_decoding
+from fastprogress import progress_bar
+
+import miniai.training as tr
 
 
 # %% ../14-huggingface-datasets.ipynb 13
@@ -38,7 +67,245 @@ def collate_dict(dataset):
     return _f
 
 
+# %% ../14-huggingface-datasets.ipynb 20
+def _is_list(typ):
+    return pa.types.is_list(typ) or pa.types.is_large_list(typ) or pa.types.is_fixed_size_list(typ)
+
+
+def _from_arrow(col):
+    """A numpy view of a numeric Arrow column with rectangular nested lists, otherwise a list of its values."""
+    col = col.combine_chunks() if isinstance(col, pa.ChunkedArray) else col
+    pylist, shape = col.to_pylist, [len(col)]
+    while _is_list(col.type):
+        if col.null_count:
+            return pylist()
+
+        if pa.types.is_fixed_size_list(col.type):
+            size = col.type.list_size
+        else:
+            lengths = np.diff(col.offsets.to_numpy())
+            if len(lengths) and (lengths != lengths[0]).any():
+                return pylist()
+            size = lengths[0] if len(lengths) else 0
+
+        shape.append(size)
+        col = col.flatten()
+
+    if col.null_count or not (pa.types.is_integer(col.type) or pa.types.is_floating(col.type)):
+        return pylist()
+    return col.to_numpy(zero_copy_only=False).reshape(shape)
+
+
+def column_to_tensor(col):
+    """A column of a batch (a tensor, numpy array or list of items) as a tensor, without copying arrays if we can."""
+    if isinstance(col, torch.Tensor):
+        return col
+
+    if isinstance(col, np.ndarray) and col.dtype != object:
+        # Arrow's buffers are read only and torch warns about that, it's fine as long as we don't modify them in place
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            return torch.from_numpy(col)
+
+    return default_collate(list(col))
+
+
+class ColumnarDataset:
+    """Wraps a Hugging Face dataset so a `DataLoader` fetches each batch with a single call, as a dict of columns."""
+
+    def __init__(self, dataset):
+        self.dataset, self.features = dataset, dataset.features
+        # We can only skip Hugging Face's formatting if it doesn't have anything to do
+        plain = dataset.format["type"] is None and not any(map(require_decoding, self.features.values()))
+        self.table = dataset.with_format("arrow") if plain else None
+
+    def __len__(self):
+        return len(self.dataset)
+
+    def __getitem__(self, i):
+        return self.dataset[i]
+
+    def __getitems__(self, idxs):
+        if self.table is None:
+            return self.dataset[idxs]
+
+        batch = self.table[idxs]
+        return {name: _from_arrow(col) for name, col in zip(batch.column_names, batch.columns)}
+
+
 # %% ../14-huggingface-datasets.ipynb 21
+def collate_columns(dataset):
+    """
+    Creates function that collates the dict of columns from a `ColumnarDataset` into tensors, in the order of dataset.features.
+    """
+    get = itemgetter(*dataset.features)
+
+    def _f(cols):
+        return get({name: column_to_tensor(cols[name]) for name in dataset.features})
+
+    return _f
+
+
+# %% ../14-huggingface-datasets.ipynb 25
+class MemmapDataset(tr.Dataset):
+    """A `training.Dataset` of the features `materialize` saved in path, memory mapped from disk."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        meta = json.loads((self.path / "meta.json").read_text())
+        self.features = meta["features"]
+        # Copy on write so the tensors are writeable, but the pages are only copied if we actually do write to them
+        self.tensors = [torch.from_numpy(np.load(self.path / f"{name}.npy", mmap_mode="c")) for name in self.features]
+        super().__init__(*self.tensors[:2])
+
+    def __getitem__(self, i):
+        return tuple(t[i] for t in self.tensors)
+
+    # Workers reopen the files rather than being sent a copy of the data
+    def __getstate__(self):
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+
+
+def _fill_cache(dataset, tfm, path, batch_size):
+    dataset, n = dataset.with_transform(tfm), len(dataset)
+    features, arrs = list(dataset.features), None
+    for i in progress_bar(range(0, n, batch_size), leave=False):
+        batch = dataset[i : i + batch_size]
+        batch = [column_to_tensor(batch[name]).numpy() for name in features]
+        # Create the files once we know what shape and type the transform gives us
+        if arrs is None:
+            arrs = [
+                np.lib.format.open_memmap(path / f"{name}.npy", "w+", o.dtype, (n, *o.shape[1:]))
+                for name, o in zip(features, batch)
+            ]
+
+        for name, arr, o in zip(features, arrs, batch):
+            if o.shape[1:] != arr.shape[1:]:
+                raise ValueError(f"{name} has shape {o.shape[1:]} for items {i}+, expected {arr.shape[1:]}")
+            arr[i : i + len(o)] = o
+
+    for arr in arrs:
+        arr.flush()
+    (path / "meta.json").write_text(json.dumps({"features": features}))
+
+
+def _write_cache(dataset, tfm, path, batch_size):
+    # Write to a temporary directory so we never leave a half written cache behind
+    tmp = path.with_name(f"{path.name}.tmp{os.getpid()}")
+    tmp.mkdir(parents=True)
+    try:
+        _fill_cache(dataset, tfm, tmp, batch_size)
+        os.rename(tmp, path)
+    except OSError:
+        # Another process may have beaten us to it
+        if not path.exists():
+            raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _source(o):
+    try:
+        return inspect.getsource(o)
+    except (OSError, TypeError):
+        return None
+
+
+def _hash_global(o):
+    """A hash of the global value o, or None for things that can't be hashed (like open files)."""
+    try:
+        return Hasher.hash(o)
+    except Exception:
+        return None
+
+
+def _names(code):
+    """The names code looks up (which includes the globals it uses), and those of any comprehensions inside it."""
+    names = list(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names += _names(const)
+    return dict.fromkeys(names)
+
+
+def _tfm_parts(f, seen=None):
+    """
+    Everything that determines what f does for hashing: its source, closure, defaults and partial arguments,
+    the values of any globals it uses, and all of those for any functions it calls by name.
+    """
+    seen = set() if seen is None else seen
+    if id(f) in seen:
+        return None
+    seen.add(id(f))
+
+    if isinstance(f, partial):
+        return ("partial", _tfm_parts(f.func, seen), f.args, f.keywords)
+    if inspect.ismethod(f):
+        return ("method", _tfm_parts(f.__func__, seen), f.__self__)
+    if not inspect.isfunction(f):
+        # Callable objects are hashed along with their class's source
+        return ("object", f, _source(type(f))) if callable(f) else f
+
+    cells = [c.cell_contents for c in f.__closure__ or ()]
+    # Globals (other than modules) can be helper functions or values like column names and normalization stats
+    names = [name for name in _names(f.__code__) if name in f.__globals__]
+    glbs = [f.__globals__[name] for name in names if not inspect.ismodule(f.__globals__[name])]
+    return (
+        f.__module__,
+        f.__qualname__,
+        _source(f) or f.__code__.co_code,
+        f.__defaults__,
+        f.__kwdefaults__,
+        [_tfm_parts(o, seen) if callable(o) else o for o in cells],
+        [_tfm_parts(o, seen) if inspect.isfunction(o) else _hash_global(o) for o in glbs],
+    )
+
+
+def _dir_size(path):
+    return sum(f.stat().st_size for f in path.iterdir())
+
+
+def _evict(path, max_size, keep):
+    """Delete the least recently used caches in path until they add up to no more than max_size bytes."""
+    caches = sorted(((p / "meta.json").stat().st_mtime, p) for p in path.iterdir() if (p / "meta.json").exists())
+    sizes = {p: _dir_size(p) for _, p in caches}
+    total = sum(sizes.values())
+    for _, p in caches:
+        if total <= max_size:
+            break
+        if p not in keep:
+            # Anyone that already has the files open can carry on using them
+            shutil.rmtree(p, ignore_errors=True)
+            total -= sizes[p]
+
+
+def materialize(dsd, tfm, path="cache", batch_size=1024, max_size=None, key=None):
+    """
+    Apply tfm to each dataset in dsd once, caching the results on disk as `MemmapDataset`s.
+    The caches are keyed on the dataset's fingerprint, the transform and key, and once they take up more than
+    max_size bytes the least recently used ones are deleted.
+    """
+    path, res = Path(path), {}
+    tfm_hash = Hasher.hash((_tfm_parts(tfm), key))
+    for split, dataset in dsd.items():
+        cache = path / f"{split}-{Hasher.hash((dataset._fingerprint, tfm_hash))}"
+        if (cache / "meta.json").exists():
+            # The modified time of the metadata tracks when each cache was last used
+            os.utime(cache / "meta.json")
+        else:
+            _write_cache(dataset, tfm, cache, batch_size)
+        res[split] = MemmapDataset(cache)
+
+    if max_size is not None:
+        _evict(path, max_size, keep={o.path for o in res.values()})
+
+    return res
+
+
+# %% ../14-huggingface-datasets.ipynb 31
 @fc.delegates(plt.Axes.imshow)  # kwargs is going to imshow
 def show_image(img, ax=None, figsize=None, title=None, noframe=True, **kwargs):
     """Show A PIL or PyTorch image on 'ax'."""
@@ -71,7 +338,7 @@ def show_image(img, ax=None, figsize=None, title=None, noframe=True, **kwargs):
     return ax
 
 
-# %% ../14-huggingface-datasets.ipynb 25
+# %% ../14-huggingface-datasets.ipynb 35
 @fc.delegates(plt.subplots, keep=True)
 def subplots(
     nrows: int = 1,  # Number of rows in returned axes grid
@@ -96,7 +363,7 @@ def subplots(
     return fig, ax
 
 
-# %% ../14-huggingface-datasets.ipynb 28
+# %% ../14-huggingface-datasets.ipynb 38
 @fc.delegates(subplots)
 def get_grid(
     n: int,  # Number of axes
@@ -114,9 +381,7 @@ def get_grid(
         nrows = nrows or int(np.ceil(n / ncols))
     else:
         nrows = int(math.sqrt(n))
-        ncols = int(np.floor(n / nrows))
-
-    print(nrows, ncols)
+        ncols = int(np.ceil(n / nrows))
 
     fig, axs = subplots(nrows, ncols, **kwargs)
 
@@ -129,18 +394,138 @@ def get_grid(
     return fig, axs
 
 
-# %% ../14-huggingface-datasets.ipynb 30
+# %% ../14-huggingface-datasets.ipynb 40
 @fc.delegates(subplots)
 def show_images(
     ims: list,  # Images to show
     nrows: int | None = None,  # Number of rows in grid
     ncols: int | None = None,  # Number of columns in grid (auto-calculated if None)
     titles: list | None = None,  # Optional list of titles for each image
+    montage: bool = False,  # Draw them all as one image with `show_montage`, which is much quicker
     **kwargs,
 ):
     """ "Show all images `ims` as subplots with `rows` using `titles`"""
+    if montage:
+        return show_montage(ims, nrows, ncols, titles, **kwargs)
 
     axs = get_grid(len(ims), nrows, ncols, **kwargs)[1].flat
 
-    for im, t, ax in zip_longest(ims, titles or [], axs):
+    for im, t, ax in zip(ims, titles or [None] * len(ims), axs):
         show_image(im, ax=ax, title=t)
+
+
+# %% ../14-huggingface-datasets.ipynb 43
+def _as_float(x):
+    return x.float() / 255 if x.dtype == torch.uint8 else x.float()
+
+
+def _as_chw(img):
+    """An image in any of the formats `show_image` takes, as a float CxHxW tensor."""
+    if fc.hasattrs(img, ("cpu", "permute")):
+        img = img.detach().cpu()
+        # Tensors are CHW unless the first axis is too long to be channels
+        if img.ndim == 3 and img.shape[0] >= 5:
+            img = img.permute(2, 0, 1)
+    else:
+        img = torch.from_numpy(np.array(img))
+        if img.ndim == 3:
+            img = img.permute(2, 0, 1)
+    return _as_float(img[None] if img.ndim == 2 else img)
+
+
+def _as_batch(ims):
+    """Images as a float NxCxHxW tensor, padding them with NaNs to the same size if they need it."""
+    if isinstance(ims, torch.Tensor):
+        ims = ims.detach().cpu()
+        if ims.ndim == 3:
+            ims = ims[:, None]
+        elif ims.shape[1] >= 5:
+            ims = ims.permute(0, 3, 1, 2)
+        return _as_float(ims)
+
+    ims = [_as_chw(o) for o in ims]
+    c, h, w = [max(o.shape[i] for o in ims) for i in range(3)]
+    return torch.stack(
+        [
+            F.pad(
+                o.expand(c, -1, -1),
+                (0, w - o.shape[2], 0, h - o.shape[1]),
+                value=np.nan,
+            )
+            for o in ims
+        ]
+    )
+
+
+def _montage(ims, nrows=None, ncols=None, padding=2, pad_value=None):
+    x = _as_batch(ims)
+    n, c, h, w = x.shape
+    if nrows:
+        ncols = ncols or math.ceil(n / nrows)
+    elif ncols:
+        nrows = math.ceil(n / ncols)
+    else:
+        nrows = int(math.sqrt(n))
+        ncols = math.ceil(n / nrows)
+
+    if pad_value is None:
+        pad_value = np.nan if c == 1 else 1.0
+    x = x.nan_to_num(pad_value) if c > 1 else x
+
+    # Fill up the last row, pad the bottom and right of each tile, then lay them all out with a reshape
+    x = torch.cat([x, x.new_full((nrows * ncols - n, c, h, w), pad_value)])
+    x = F.pad(x, (0, padding, 0, padding), value=pad_value)
+    grid = x.view(nrows, ncols, c, h + padding, w + padding).permute(2, 0, 3, 1, 4)
+    grid = grid.reshape(c, nrows * (h + padding), ncols * (w + padding))
+    grid = F.pad(grid, (padding, 0, padding, 0), value=pad_value)
+    return (grid[0] if c == 1 else grid.permute(1, 2, 0)), (nrows, ncols, h, w)
+
+
+def montage(
+    ims,  # Images to lay out: a list of PIL images, arrays or tensors, or a batch tensor
+    nrows=None,  # Number of rows in grid
+    ncols=None,  # Number of columns in grid
+    padding=2,  # Pixels between the images
+    pad_value=None,  # Value to pad with, NaN for greyscale and 1 (white) for colour by default
+):
+    """All of `ims` as one HxWxC (or HxW for greyscale) image tensor, in a grid with padding between them."""
+    return _montage(ims, nrows, ncols, padding, pad_value)[0]
+
+
+def show_montage(
+    ims,  # Images to show
+    nrows=None,  # Number of rows in grid
+    ncols=None,  # Number of columns in grid
+    titles=None,  # Optional list of titles, drawn on each image
+    padding=2,  # Pixels between the images
+    fname=None,  # Save the montage as a PNG here
+    imsize=1,  # Size (in inches) of each image
+    figsize=None,  # Size of the whole figure, instead of imsize
+    **kwargs,  # Passed to `show_image`
+):
+    """Show all images `ims` as one image with `montage`, or save them straight to `fname` if there are no titles."""
+    grid, (nrows, ncols, h, w) = _montage(ims, nrows, ncols, padding)
+    if fname is not None and titles is None:
+        if grid.ndim == 2:
+            # The PNG would have transparent padding, so pad with the brightest value instead
+            grid = grid.nan_to_num(grid[~grid.isnan()].max().item())
+        plt.imsave(fname, grid.numpy(), cmap=kwargs.get("cmap"))
+        return
+
+    ax = show_image(grid, figsize=figsize or (ncols * imsize, nrows * imsize), **kwargs)
+    for i, title in enumerate(titles or []):
+        row, col = divmod(i, ncols)
+        x, y = padding + col * (w + padding) + w / 2, padding + row * (h + padding)
+        ax.text(
+            x,
+            y,
+            str(title),
+            ha="center",
+            va="top",
+            fontsize=8,
+            bbox={"fc": "white", "alpha": 0.6, "pad": 1},
+        )
+
+    if fname is not None:
+        ax.figure.savefig(fname, bbox_inches="tight")
+    return ax
@@ -0,0 +1,158 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../15g-distributed.ipynb.
+
+# %% auto 0
+__all__ = ["launch", "shard_dl", "shard_dls", "DDPCB"]
+
+# %% ../15g-distributed.ipynb 1
+import os
+import pickle
+import socket
+
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+from torch.nn.parallel import DistributedDataParallel
+from torch.utils.data import DataLoader, RandomSampler, IterableDataset
+from torch.utils.data.distributed import DistributedSampler
+
+import fastcore.all as fc
+
+import miniai.training as tr
+import miniai.learner as ln
+
+
+# %% ../15g-distributed.ipynb 4
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _worker(rank, fn, world_size, backend, port, threads, results, args):
+    os.environ["MASTER_ADDR"], os.environ["MASTER_PORT"] = "127.0.0.1", str(port)
+    if threads is not None:
+        torch.set_num_threads(threads)
+
+    dist.init_process_group(backend, rank=rank, world_size=world_size)
+    try:
+        # Pickle the result ourselves so tensors are copied rather than shared with a process that's about to exit
+        results.put((rank, pickle.dumps(fn(rank, world_size, *args))))
+    finally:
+        dist.destroy_process_group()
+
+
+def launch(fn, n_procs, *args, backend="gloo", start_method="fork", threads=None):
+    """Run `fn(rank, world_size, *args)` in `n_procs` processes, returning the results in rank order."""
+    # Share the cores out between the processes by default
+    if threads is None:
+        threads = max(1, (os.cpu_count() or 1) // n_procs)
+
+    results = mp.get_context(start_method).SimpleQueue()
+    mp.start_processes(
+        _worker,
+        args=(fn, n_procs, backend, _free_port(), threads, results, args),
+        nprocs=n_procs,
+        start_method=start_method,
+    )
+
+    return [pickle.loads(res) for _, res in sorted(results.get() for _ in range(n_procs))]
+
+
+# %% ../15g-distributed.ipynb 7
+def shard_dl(dl, rank=None, world_size=None):
+    """A copy of `dl` that only loads this process's share of the data."""
+    # Iterable datasets have to split their data up between the processes themselves
+    if isinstance(dl.dataset, IterableDataset):
+        return dl
+
+    # Dataloaders that index whole batches at a time keep their sampler inside the batch sampler
+    batched = isinstance(dl.sampler, tr.TensorBatchSampler)
+    sampler = dl.sampler.sampler if batched else dl.sampler
+
+    sampler = DistributedSampler(
+        dl.dataset,
+        num_replicas=world_size,
+        rank=rank,
+        shuffle=isinstance(sampler, RandomSampler),
+    )
+    if batched:
+        return tr.batch_dl(
+            dl.dataset,
+            dl.sampler.batch_size,
+            drop_last=dl.sampler.drop_last,
+            sampler=sampler,
+            num_workers=dl.num_workers,
+            pin_memory=dl.pin_memory,
+            worker_init_fn=dl.worker_init_fn,
+            persistent_workers=dl.persistent_workers,
+        )
+
+    return DataLoader(
+        dl.dataset,
+        dl.batch_size,
+        sampler=sampler,
+        num_workers=dl.num_workers,
+        collate_fn=dl.collate_fn,
+        pin_memory=dl.pin_memory,
+        drop_last=dl.drop_last,
+        worker_init_fn=dl.worker_init_fn,
+        persistent_workers=dl.persistent_workers,
+    )
+
+
+def shard_dls(dls, rank=None, world_size=None):
+    """Shard both of the dataloaders in a `DataLoaders`."""
+    return ln.DataLoaders(shard_dl(dls.train, rank, world_size), shard_dl(dls.valid, rank, world_size))
+
+
+# %% ../15g-distributed.ipynb 9
+class _JoinLoader:
+    """Iterates through dl in `DistributedDataParallel`'s join context, so processes can run out of batches early."""
+
+    def __init__(self, dl, model):
+        self.dl, self.model = dl, model
+
+    def __len__(self):
+        return len(self.dl)
+
+    def __iter__(self):
+        with self.model.join():
+            yield from self.dl
+
+
+class DDPCB(ln.Callback):
+    """Trains with `DistributedDataParallel` on sharded dataloaders."""
+
+    # After the DeviceCB has moved the model
+    order = ln.DeviceCB.order + 2
+
+    def __init__(self, shard=True, **ddp_kwargs):
+        self.shard, self.ddp_kwargs = shard, ddp_kwargs
+
+    def before_fit(self):
+        self.model, self.dls = self.learn.model, self.learn.dls
+        if self.shard:
+            self.learn.dls = shard_dls(self.dls)
+
+        param = next(self.model.parameters())
+        device_ids = [param.device] if param.is_cuda else None
+        self.ddp = DistributedDataParallel(self.model, device_ids=device_ids, **self.ddp_kwargs)
+        self.learn.model = self.ddp
+
+    def before_epoch(self):
+        sampler = getattr(self.learn.dls.train, "sampler", None)
+        if isinstance(sampler, tr.TensorBatchSampler):
+            sampler = sampler.sampler
+        if self.learn.model.training and isinstance(sampler, DistributedSampler):
+            sampler.set_epoch(self.learn.epoch)
+
+        if self.learn.model.training:
+            # Processes may not all get the same number of batches from an iterable dataset
+            self.learn.model = self.ddp.train()
+            self.learn.dl = _JoinLoader(self.learn.dl, self.ddp)
+        else:
+            # There's nothing to sync when validating, and once DDP has been joined it syncs on every forward pass
+            self.learn.model = self.model
+
+    def cleanup_fit(self):
+        self.learn.model, self.learn.dls = self.model, self.dls
@@ -3,36 +3,63 @@
 # %% auto 0
 __all__ = [
     "DataLoaders",
+    "PrefetchLoader",
+    "with_settings",
+    "seed_worker",
+    "seeded",
+    "with_batch_size",
+    "autotune_dl",
     "Callback",
     "CancelFitException",
     "CancelBatchException",
     "CancelEpochException",
+    "CancelInferenceException",
+    "get_cb_methods",
     "run_cbs",
     "DeviceCB",
     "to_cpu",
+    "to_detached",
+    "is_distributed",
+    "is_main_process",
     "MetricsCB",
     "with_cbs",
     "Learner",
     "TrainCB",
     "ProgressCB",
     "MomentumLearner",
+    "MixedPrecisionCB",
+    "CompileCB",
     "LRFinderCB",
 ]
 
 # %% ../15c-learner.ipynb 1
+import os
+import json
+import random
 import math
+import time
+import platform
+import warnings
+import threading
+from queue import Queue, Full
 from copy import copy
 from operator import attrgetter
 from collections.abc import Mapping
 from functools import partial
+from statistics import median
+from pathlib import Path
+
+import numpy as np
 
 import torch
 from torch import optim
+import torch.distributed as dist
 
-from torch.utils.data import DataLoader
+from torch.utils.data import DataLoader, IterableDataset, Sampler
 from torch.optim.lr_scheduler import ExponentialLR
 
 from torcheval.metrics import Mean
+from torcheval.metrics.toolkit import sync_and_compute
 
 import fastcore.all as fc
 from fastprogress import progress_bar, master_bar
@@ -52,25 +79,321 @@ class DataLoaders:
         self.train, self.valid = dls[:2]
 
     @classmethod
-    def from_dsd(cls, dsd, batch_size, num_workers=4):
-        """Create dataloaders from a dataset dict."""
-        return cls(
-            *[
-                DataLoader(
-                    d,
-                    batch_size,
-                    num_workers=num_workers,
-                    collate_fn=ds.collate_dict(d),
-                )
-                for d in dsd.values()
-            ]
+    def from_dsd(cls, dsd, batch_size, num_workers=4, collate_fn=ds.collate_columns, batch_sampler=None, **kwargs):
+        """
+        Create dataloaders from a dataset dict, fetching and collating each batch a column at a time.
+        collate_fn creates the collate function for a dataset, and batch_sampler(dataset, batch_size, train)
+        optionally creates a batch sampler for one, the first dataset in the dict being the training set.
+        """
+        # Keep the workers around between epochs rather than starting them up again each time
+        kwargs.setdefault("persistent_workers", num_workers > 0)
+
+        def _dl(d, train):
+            d = ds.ColumnarDataset(d)
+            batches = {"batch_size": batch_size}
+            if batch_sampler is not None:
+                batches = {"batch_sampler": batch_sampler(d.dataset, batch_size, train)}
+            return DataLoader(d, **batches, num_workers=num_workers, collate_fn=collate_fn(d), **kwargs)
+
+        return cls(*[_dl(d, i == 0) for i, d in enumerate(dsd.values())])
+
+    def prefetch(self, device=cv.def_device, n=2, pin_memory=None):
+        """Wrap both dataloaders in a `PrefetchLoader`."""
+        return type(self)(
+            PrefetchLoader(self.train, device, n, pin_memory),
+            PrefetchLoader(self.valid, device, n, pin_memory),
         )
 
+    def autotune(self, n_batches=200, cache=None, **kwargs):
+        """Find the fastest worker settings for the training dataloader with `autotune_dl` and use them for both."""
+        settings = autotune_dl(self.train, n_batches, cache=cache, **kwargs)
+        return type(self)(with_settings(self.train, **settings), with_settings(self.valid, **settings))
+
+    def seeded(self, seed):
+        """Give both dataloaders their own generators seeded with seed, see `seeded`."""
+        return type(self)(seeded(self.train, seed), seeded(self.valid, seed))
+
+
+# %% ../15c-learner.ipynb 11
+def _batch_tensors(batch):
+    return batch.values() if isinstance(batch, Mapping) else batch
+
+
+def _batch_len(batch):
+    return len(next(iter(_batch_tensors(batch))))
+
+
+def _slice_batch(batch, idx):
+    if isinstance(batch, Mapping):
+        return {k: v[idx] for k, v in batch.items()}
+
+    return type(batch)(o[idx] for o in batch)
+
+
+def _pin_memory(batch):
+    if isinstance(batch, Mapping):
+        return {k: v.pin_memory() for k, v in batch.items()}
+
+    return type(batch)(o.pin_memory() for o in batch)
+
+
+class PrefetchLoader:
+    """Wraps a dataloader, loading the next `n` batches and moving them to `device` on a background thread."""
+
+    _done = object()
+
+    def __init__(self, dl, device=cv.def_device, n=2, pin_memory=None):
+        self.dl, self.device, self.n = dl, torch.device(device), n
+        self.pin_memory = self.device.type == "cuda" if pin_memory is None else pin_memory
+
+    def __len__(self):
+        return len(self.dl)
+
+    def _load(self, queue, stop):
+        """Runs on the background thread, filling up the queue with batches that are on the device."""
+        stream = torch.cuda.Stream(self.device) if self.device.type == "cuda" else None
+        try:
+            for batch in self.dl:
+                if self.pin_memory:
+                    batch = _pin_memory(batch)
+
+                ready = None
+                if stream is None:
+                    batch = cv.to_device(batch, self.device)
+                else:
+                    # Copy on our own stream and let the consumer wait for it to finish
+                    with torch.cuda.stream(stream):
+                        batch = cv.to_device(batch, self.device, non_blocking=self.pin_memory)
+                        ready = torch.cuda.Event()
+                        ready.record(stream)
+
+                if not self._put(queue, stop, (batch, ready, None)):
+                    return
+        except Exception as e:
+            self._put(queue, stop, (None, None, e))
+            return
+
+        self._put(queue, stop, (self._done, None, None))
+
+    def _put(self, queue, stop, item):
+        """Put an item on the queue unless we've been told to stop. Returns False if we should stop."""
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+
+        return False
+
+    def __iter__(self):
+        queue, stop = Queue(maxsize=self.n), threading.Event()
+        thread = threading.Thread(target=self._load, args=(queue, stop), daemon=True)
+        thread.start()
+
+        try:
+            while True:
+                batch, ready, error = queue.get()
+                if error is not None:
+                    raise error
+                if batch is self._done:
+                    return
+
+                if ready is not None:
+                    current = torch.cuda.current_stream(self.device)
+                    current.wait_event(ready)
+                    # Stop the allocator reusing the memory while the current stream is still using it
+                    for o in _batch_tensors(batch):
+                        o.record_stream(current)
+
+                yield batch
+        finally:
+            # We might not have been run to the end (eg. a CancelEpochException) so tidy up the thread
+            stop.set()
+            thread.join()
+
 
 # %% ../15c-learner.ipynb 14
+def with_settings(dl, **kwargs):
+    """A copy of dl that loads the same batches, with different `DataLoader` settings such as num_workers."""
+    if isinstance(dl.dataset, IterableDataset):
+        settings = {"batch_size": dl.batch_size, "drop_last": dl.drop_last}
+    elif dl.batch_sampler is not None:
+        settings = {"batch_sampler": dl.batch_sampler}
+    else:
+        settings = {"batch_size": None, "sampler": dl.sampler}
+
+    settings.update(
+        num_workers=dl.num_workers,
+        prefetch_factor=dl.prefetch_factor,
+        persistent_workers=dl.persistent_workers,
+        pin_memory=dl.pin_memory,
+        collate_fn=dl.collate_fn,
+        timeout=dl.timeout,
+        worker_init_fn=dl.worker_init_fn,
+        generator=dl.generator,
+    )
+    settings.update(kwargs)
+    # These only apply to worker processes
+    if settings["num_workers"] == 0:
+        settings.update(prefetch_factor=None, persistent_workers=False)
+
+    return DataLoader(dl.dataset, **settings)
+
+
+def seed_worker(worker_id):
+    """Seed python's and numpy's RNGs in a dataloader worker from the seed pytorch gave it."""
+    seed = torch.initial_seed() % 2**32
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def _with_generator(sampler, gen):
+    """A copy of a (batch) sampler, and the sampler it wraps, that draws its random numbers from gen."""
+    sampler = copy(sampler)
+    if hasattr(sampler, "generator"):
+        sampler.generator = gen
+    if isinstance(getattr(sampler, "sampler", None), Sampler):
+        sampler.sampler = _with_generator(sampler.sampler, gen)
+    return sampler
+
+
+def seeded(dl, seed):
+    """
+    A copy of dl that shuffles and seeds its workers from its own generator, so it loads the same batches
+    each run whatever else uses the global RNG.
+    """
+    gen = torch.Generator().manual_seed(seed)
+    kwargs = {}
+    if not isinstance(dl.dataset, IterableDataset):
+        if dl.batch_sampler is not None:
+            kwargs["batch_sampler"] = _with_generator(dl.batch_sampler, gen)
+        else:
+            kwargs["sampler"] = _with_generator(dl.sampler, gen)
+
+    return with_settings(dl, generator=gen, worker_init_fn=seed_worker, **kwargs)
+
+
+def with_batch_size(dl, batch_size):
+    """A copy of dl that loads batches of batch_size, in the same order."""
+    if isinstance(dl, PrefetchLoader):
+        return PrefetchLoader(with_batch_size(dl.dl, batch_size), dl.device, dl.n, dl.pin_memory)
+    if not isinstance(dl, DataLoader):
+        raise ValueError(f"Can't change the batch size of a {type(dl).__name__}")
+
+    if isinstance(dl.dataset, IterableDataset):
+        if dl.batch_size is None:
+            raise ValueError("The dataset makes its own batches so we can't change their size")
+        return with_settings(dl, batch_size=batch_size)
+
+    sampler = dl.batch_sampler if dl.batch_sampler is not None else dl.sampler
+    if not hasattr(sampler, "batch_size"):
+        raise ValueError(f"Can't change the batch size of a {type(sampler).__name__}")
+
+    sampler = copy(sampler)
+    sampler.batch_size = batch_size
+    return with_settings(dl, **{"batch_sampler" if dl.batch_sampler is not None else "sampler": sampler})
+
+
+def _time_dl(dl, n_batches, warmup=2):
+    """
+    Seconds per batch for up to n_batches, after loading warmup batches (at least one per worker) that aren't timed
+    so starting up the workers isn't counted. Raises a ValueError if there are fewer than 2 batches left to time.
+    """
+    it = iter(dl)
+    for _ in zip(range(max(warmup, dl.num_workers)), it):
+        pass
+
+    start, n = time.perf_counter(), 0
+    for _ in zip(range(n_batches), it):
+        n += 1
+    secs = time.perf_counter() - start
+    # Shut any workers down before we try the next settings
+    del it
+
+    if n < 2:
+        raise ValueError(f"Only {n} batches were left to time after the warmup, autotune_dl needs a longer dl")
+    return secs / n
+
+
+def _dl_key(dl):
+    dset = getattr(dl.dataset, "dataset", dl.dataset)
+    name = getattr(dset, "_fingerprint", None) or type(dset).__name__
+    n = len(dset) if hasattr(dset, "__len__") else None
+    batch_size = getattr(dl.batch_sampler or dl.sampler, "batch_size", dl.batch_size)
+    return f"{platform.node()}-{os.cpu_count()}-{name}-{n}-{batch_size}"
+
+
+def _powers_of_two(n):
+    res = [0] + [2**i for i in range(int(math.log2(n)) + 1)]
+    return res if n in res else res + [n]
+
+
+def autotune_dl(dl, n_batches=200, max_workers=None, cache=None, key=None, verbose=True, warmup=2):
+    """
+    Time dl with different `DataLoader` settings, returning the fastest num_workers, prefetch_factor,
+    persistent_workers and pin_memory for this machine. If cache is a path, results are saved there by key.
+    Each setting times n_batches (at least 2) after warmup batches (at least 2, and one per worker) that aren't timed,
+    so dl needs at least `warmup + 2` batches, or `num_workers + 2` if that's more.
+    """
+    if n_batches < 2 or warmup < 2:
+        raise ValueError("autotune_dl needs to time at least 2 batches after at least 2 warmup batches")
+
+    key = key or _dl_key(dl)
+    cache = None if cache is None else os.path.expanduser(cache)
+    cached = json.load(open(cache)) if cache is not None and os.path.exists(cache) else {}
+    if key in cached:
+        return cached[key]
+
+    def _try(**kwargs):
+        secs = _time_dl(with_settings(dl, **kwargs), n_batches, warmup)
+        if verbose:
+            print(f"{kwargs}: {secs * 1e3:.2f}ms/batch")
+        return secs
+
+    # Keep adding workers until it stops helping
+    times = {}
+    for n in _powers_of_two(max_workers or os.cpu_count() or 1):
+        times[n] = _try(
+            num_workers=n,
+            prefetch_factor=2 if n else None,
+            persistent_workers=False,
+            pin_memory=False,
+        )
+        if times[n] > min(times.values()) * 1.1:
+            break
+    workers = min(times, key=times.get)
+    best = dict(
+        num_workers=workers,
+        prefetch_factor=None,
+        persistent_workers=workers > 0,
+        pin_memory=False,
+    )
+
+    if workers > 0:
+        times = {n: _try(**{**best, "prefetch_factor": n}) for n in (2, 4, 8)}
+        best["prefetch_factor"] = min(times, key=times.get)
+
+    if torch.cuda.is_available():
+        times = {pin: _try(**{**best, "pin_memory": pin}) for pin in (False, True)}
+        best["pin_memory"] = min(times, key=times.get)
+
+    if cache is not None:
+        cached[key] = best
+        os.makedirs(os.path.dirname(cache) or ".", exist_ok=True)
+        with open(f"{cache}.tmp", "w") as f:
+            json.dump(cached, f, indent=2)
+        os.replace(f"{cache}.tmp", cache)
+
+    return best
+
+
+# %% ../15c-learner.ipynb 20
 # Base class for all callbacks
 class Callback:
     order = 0
+    # Most callbacks are only for training, those that set this are run by `Learner.get_preds` too
+    inference = False
 
 
 # Exceptions thrown by Callbacks exception occurs in the related function
@@ -86,16 +409,26 @@ class CancelEpochException(Exception):
     pass
 
 
+class CancelInferenceException(Exception):
+    pass
+
+
+# Gets the bound method_name of each callback that has one, in order
+def get_cb_methods(cbs, method_name):
+    methods = (getattr(cb, method_name, None) for cb in sorted(cbs, key=attrgetter("order")))
+    return [method for method in methods if method is not None]
+
+
 # Runs the given method on all callbacks in order
 def run_cbs(cbs, method_name):
-    for cb in sorted(cbs, key=attrgetter("order")):
-        method = getattr(cb, method_name, None)
-        if method is not None:
-            method()
+    for method in get_cb_methods(cbs, method_name):
+        method()
 
 
-# %% ../15c-learner.ipynb 19
+# %% ../15c-learner.ipynb 25
 class DeviceCB(Callback):
+    inference = True
+
     def __init__(self, device=cv.def_device):
         fc.store_attr()
 
@@ -104,11 +437,14 @@ class DeviceCB(Callback):
     def before_fit(self):
         self.learn.model.to(self.device)
 
+    def before_inference(self):
+        self.learn.model.to(self.device)
+
     def before_batch(self):
         self.learn.batch = cv.to_device(self.learn.batch, device=self.device)
 
 
-# %% ../15c-learner.ipynb 29
+# %% ../15c-learner.ipynb 35
 def to_cpu(x):
     """Takes maps, lists and tuples of tensors or just tensors and moves them to the cpu"""
     if isinstance(x, Mapping):
@@ -119,17 +455,46 @@ def to_cpu(x):
         return tuple(to_cpu(list(x)))
 
     res = x.detach().cpu()
-    return res.float() if res.dtype == torch.float16 else res
+    return res.float() if res.dtype in (torch.float16, torch.bfloat16) else res
+
+
+def to_detached(x):
+    """Like `to_cpu` but leaves the tensors on the device they are already on"""
+    if isinstance(x, Mapping):
+        return {k: to_detached(v) for k, v in x.items()}
+    if isinstance(x, list):
+        return [to_detached(o) for o in x]
+    if isinstance(x, tuple):
+        return tuple(to_detached(list(x)))
+
+    res = x.detach()
+    return res.float() if res.dtype in (torch.float16, torch.bfloat16) else res
+
+
+def is_distributed():
+    """Are we running in a `torch.distributed` process group with more than one process."""
+    return dist.is_available() and dist.is_initialized() and dist.get_world_size() > 1
+
+
+def is_main_process():
+    """Are we rank 0 (or not running distributed), where logging and saving should happen."""
+    return not is_distributed() or dist.get_rank() == 0
 
 
 class MetricsCB(Callback):
-    """Tracks a set of metrics + a loss (weighted avg of the losses)."""
+    """
+    Tracks a set of metrics + a loss (weighted avg of the losses).
+    With on_device=True the metrics are accumulated on the device the batches are on,
+    so nothing is copied back to the host until the metrics are computed at the end of the epoch.
+    When running distributed the metrics are combined across all the processes and only rank 0 logs them.
+    """
 
-    def __init__(self, *pos_metrics, **metrics):
+    def __init__(self, *pos_metrics, on_device=False, **metrics):
         # Positional args become metrics named after the type of the class
         for metric in pos_metrics:
             metrics[type(metric).__name__] = metric
 
+        self.on_device = on_device
         self.metrics = metrics
         self.loss = Mean()
 
@@ -137,7 +502,11 @@ class MetricsCB(Callback):
         self.all_metrics["loss"] = self.loss
 
     def _log(self, data):
-        print(data)
+        if is_main_process():
+            print(data)
+
+    def _compute(self, metric):
+        return sync_and_compute(metric) if is_distributed() else metric.compute()
 
     def before_fit(self):
         self.learn.metrics = self
@@ -152,16 +521,28 @@ class MetricsCB(Callback):
             "train": "train" if self.learn.model.training else "eval",
         }
 
-        for name, metric in self.all_metrics.items():
-            data[name] = f"{metric.compute():.3f}"
+        # Keep the values around for anything else that wants to record them
+        self.values = {name: self._compute(metric).item() for name, metric in self.all_metrics.items()}
+        for name, value in self.values.items():
+            data[name] = f"{value:.3f}"
 
         self._log(data)
 
     def after_batch(self):
-        # We need to make sure all tensors are on the same device so just move them to the CPU
-        x, y = to_cpu(self.learn.batch)
-        preds = to_cpu(self.learn.preds)
-        loss = to_cpu(self.learn.loss)
+        if self.on_device:
+            # Keep everything where it is, we just need the metrics to be on the same device
+            x, y = to_detached(self.learn.batch)
+            preds = to_detached(self.learn.preds)
+            loss = to_detached(self.learn.loss)
+
+            if self.loss.device != loss.device:
+                for metric in self.all_metrics.values():
+                    metric.to(loss.device)
+        else:
+            # We need to make sure all tensors are on the same device so just move them to the CPU
+            x, y = to_cpu(self.learn.batch)
+            preds = to_cpu(self.learn.preds)
+            loss = to_cpu(self.learn.loss)
 
         # Update all of the metrics
         for metric in self.metrics.values():
@@ -171,7 +552,7 @@ class MetricsCB(Callback):
         self.loss.update(loss, weight=len(x))
 
 
-# %% ../15c-learner.ipynb 32
+# %% ../15c-learner.ipynb 38
 class with_cbs:
     """
     Decorator that adds before and after callbacks to a function.
@@ -181,56 +562,223 @@ class with_cbs:
     def __init__(self, name):
         self.name = name
 
+        # Work out the event names and exception once rather than on every call
+        self.before, self.after, self.cleanup = (
+            f"before_{name}",
+            f"after_{name}",
+            f"cleanup_{name}",
+        )
+        self.exception = globals()[f"Cancel{name.title()}Exception"]
+
     def __call__(self, fn):
         def _fn(o, *args, **kwargs):
             try:
-                o.callback(f"before_{self.name}")
+                o.callback(self.before)
                 fn(o, *args, **kwargs)
-                o.callback(f"after_{self.name}")
-            except globals()[f"Cancel{self.name.title()}Exception"]:
+                o.callback(self.after)
+            except self.exception:
                 pass
             finally:
-                o.callback(f"cleanup_{self.name}")
+                o.callback(self.cleanup)
 
         return _fn
 
 
-# %% ../15c-learner.ipynb 33
+# %% ../15c-learner.ipynb 39
+class _PredsBuffer:
+    """
+    Collects batches of predictions into a tensor allocated for the whole dataset when the first one arrives,
+    backed by a memory mapped .npy file if given a path. If we don't know how big the dataset is they're concatenated.
+    """
+
+    def __init__(self, n, path=None):
+        self.n, self.path = n, path
+        self.data, self.chunks, self.pos = None, [], 0
+
+    def add(self, x):
+        x = to_cpu(x)
+        if self.n is None:
+            self.chunks.append(x)
+            return
+
+        if self.data is None:
+            self.data = self._alloc((self.n, *x.shape[1:]), x.dtype)
+        self.data[self.pos : self.pos + len(x)] = x
+        self.pos += len(x)
+
+    def _alloc(self, shape, dtype):
+        if self.path is None:
+            return torch.empty(shape, dtype=dtype)
+
+        dtype = torch.empty(0, dtype=dtype).numpy().dtype
+        return torch.from_numpy(np.lib.format.open_memmap(self.path, mode="w+", dtype=dtype, shape=shape))
+
+    def result(self):
+        if self.n is not None:
+            # Less than the whole dataset if the dataloader drops the last batch
+            return self.data[: self.pos]
+
+        res = torch.cat(self.chunks)
+        if self.path is not None:
+            np.save(self.path, res.numpy())
+        return res
+
+
+def _n_items(dl):
+    """How many items dl loads, if it knows."""
+    if isinstance(dl, PrefetchLoader):
+        dl = dl.dl
+    try:
+        return len(getattr(dl, "dataset", None))
+    except TypeError:
+        return None
+
+
 class Learner:
-    def __init__(self, model, dls, loss_func, lr, callbacks, opt_func=optim.SGD):
+    """
+    Runs the training loop, deferring to callbacks for anything interesting.
+    `grad_accum` accumulates the gradients over that many batches before stepping the optimizer,
+    `micro_batch_size` splits each training batch up to run the forward and backward passes on smaller pieces.
+    Either way the loss is scaled so that the gradients match a single large batch. The last group of an epoch can be
+    short, it's scaled by its own size if the dataloader has a length (otherwise by 1/grad_accum).
+    If a callback sets `grad_scaler` (eg. a `torch.amp.GradScaler`) the loss is also scaled by that before backward.
+    Callbacks that skip the start of an epoch set `batch_offset` in before_epoch, so `num` is still the batch's position
+    in the whole epoch.
+    """
+
+    def __init__(
+        self,
+        model,
+        dls,
+        loss_func,
+        lr,
+        callbacks,
+        opt_func=optim.SGD,
+        grad_accum=1,
+        micro_batch_size=None,
+    ):
         fc.store_attr()
+        self.callbacks = list(callbacks)
         for cb in self.callbacks:
             cb.learn = self
 
+        self._dispatch = {}
+        self.grad_scaler = None
+
+    def add_cb(self, cb):
+        """Add a callback, it will be picked up by the next event that runs."""
+        cb.learn = self
+        self.callbacks.append(cb)
+        self._dispatch.clear()
+
+    def remove_cb(self, cb):
+        """Remove a callback, it wont be called by any later events."""
+        self.callbacks.remove(cb)
+        self._dispatch.clear()
+
     @with_cbs("batch")
     def one_batch(self):
         """Run one training/validation for one batch of data."""
-        self.predict()
-        self.calc_loss()
+        if self.model.training and self.micro_batch_size:
+            self._micro_batches()
+        else:
+            self._forward()
 
-        if self.model.training:
-            self.backward()
+            if self.model.training:
+                self._scaled_backward(1 / self._accum_size())
+
+        if self.model.training and self._should_step():
             self.step()
             self.zero_grad()
 
+    def _micro_batches(self):
+        """Run the forward and backward passes in pieces, putting the preds and loss back together at the end."""
+        batch, n = self.batch, _batch_len(self.batch)
+        preds, loss = [], 0.0
+
+        for i in range(0, n, self.micro_batch_size):
+            self.batch = _slice_batch(batch, slice(i, i + self.micro_batch_size))
+            self._forward()
+
+            # Weight each piece by its size so the grads match the whole batch
+            size = _batch_len(self.batch)
+            self._scaled_backward(size / n / self._accum_size())
+
+            preds.append(self.preds.detach())
+            loss += self.loss.detach() * size
+
+        self.batch, self.preds, self.loss = batch, torch.cat(preds), loss / n
+
+    def _forward(self):
+        """Run predict and calc_loss, callbacks can wrap them with before_forward and after_forward."""
+        self.callback("before_forward")
+        try:
+            self.predict()
+            self.calc_loss()
+        finally:
+            self.callback("after_forward")
+
+    def _scaled_backward(self, scale):
+        """Run backward on the loss multiplied by scale, leaving the unscaled loss for the callbacks."""
+        if scale == 1 and self.grad_scaler is None:
+            self.backward()
+            return
+
+        loss = self.loss
+        self.loss = loss * scale if self.grad_scaler is None else self.grad_scaler.scale(loss * scale)
+        try:
+            self.backward()
+        finally:
+            self.loss = loss
+
+    def _accum_size(self):
+        """How many batches the current group accumulates, fewer than grad_accum at the end of the epoch."""
+        if self.n_batches is None:
+            return self.grad_accum
+
+        start = self.num - self.num % self.grad_accum
+        return min(self.grad_accum, self.n_batches - start)
+
+    def _should_step(self):
+        """Step every grad_accum batches, and on the last batch of the epoch so nothing carries over."""
+        if self.grad_accum == 1:
+            return True
+
+        n = self.num + 1
+        return n % self.grad_accum == 0 or n == self.n_batches
+
     def one_epoch(self, train):
         """Run a single epoch of training or validation."""
         self.model.train(train)
         self.dl = self.dls.train if train else self.dls.valid
+        # Dataloaders for iterable datasets may not know how many batches they have
+        try:
+            self.n_batches = len(self.dl)
+        except TypeError:
+            self.n_batches = None
 
+        self.batch_offset = 0
         self._one_epoch()
 
     @with_cbs("epoch")
     def _one_epoch(self):
-        for self.num, self.batch in enumerate(self.dl):
+        self.num = self.batch_offset - 1
+        for self.num, self.batch in enumerate(self.dl, self.batch_offset):
             self.one_batch()
 
+        # Without a length we couldn't tell which batch was the last, so step on any grads still accumulating
+        if self.model.training and self.n_batches is None and (self.num + 1) % self.grad_accum:
+            self.step()
+            self.zero_grad()
+
     def fit(self, n_epochs):
         """Run training and validation for a number of epochs."""
         self.n_epochs = n_epochs
         self.epochs = range(n_epochs)
         self.opt = self.opt_func(self.model.parameters(), self.lr)
 
+        # Callbacks may have been changed directly since the last fit so resolve them again
+        self._dispatch.clear()
         self._fit()
 
     @with_cbs("fit")
@@ -239,21 +787,95 @@ class Learner:
             self.one_epoch(True)
             self.one_epoch(False)
 
+    def get_preds(
+        self,
+        dl=None,
+        batch_size=None,
+        probs=False,
+        classes=False,
+        targets=False,
+        path=None,
+    ):
+        """
+        Predict on dl (the validation set by default) under inference mode, only running the callbacks that support it.
+        Without gradients to keep there's usually room for a larger batch_size than training.
+        The preds are copied into one tensor as they're made, or into .npy files in path so they needn't fit in memory.
+        probs runs the preds through a softmax, classes and targets also return the predicted class indices and targets.
+        """
+        dl = self.dls.valid if dl is None else dl
+        if batch_size is not None:
+            dl = with_batch_size(dl, batch_size)
+        if path is not None:
+            path = Path(path)
+            path.mkdir(parents=True, exist_ok=True)
+
+        names = ["preds"] + ["classes"] * classes + ["targets"] * targets
+        n = _n_items(dl)
+        self.pred_buffers = {name: _PredsBuffer(n, path and path / f"{name}.npy") for name in names}
+        self.probs, self.dl = probs, dl
+
+        callbacks, training = self.callbacks, self.model.training
+        self.callbacks = [cb for cb in callbacks if cb.inference]
+        self._dispatch.clear()
+        try:
+            self.model.eval()
+            with torch.inference_mode():
+                self._inference()
+        finally:
+            self.callbacks = callbacks
+            self._dispatch.clear()
+            self.model.train(training)
+
+        res = tuple(buf.result() for buf in self.pred_buffers.values())
+        return res[0] if len(res) == 1 else res
+
+    @with_cbs("inference")
+    def _inference(self):
+        for self.num, self.batch in enumerate(self.dl):
+            self._inference_batch()
+
+    @with_cbs("batch")
+    def _inference_batch(self):
+        self.callback("before_forward")
+        try:
+            self.predict()
+        finally:
+            self.callback("after_forward")
+
+        bufs = self.pred_buffers
+        bufs["preds"].add(self.preds.float().softmax(-1) if self.probs else self.preds)
+        if "classes" in bufs:
+            bufs["classes"].add(self.preds.argmax(-1))
+        if "targets" in bufs:
+            bufs["targets"].add(self.batch[1])
+
     def __getattr__(self, name):
         # If these methods dont exist, we are going to defer them to our callbacks
         # so we return a partial that calls our callback fn.
+        # We store it on the instance so we only end up in here once per name.
         if name in ("predict", "calc_loss", "backward", "step", "zero_grad"):
-            return partial(self.callback, name)
+            method = partial(self.callback, name)
+            self.__dict__[name] = method
+            return method
 
         raise AttributeError(name)
 
     def callback(self, method_name):
         """ "Go through callbacks, sorted by the order attribute and call their relavant method name."""
-        run_cbs(self.callbacks, method_name)
+        # Each event is resolved into a list of bound methods the first time it's run,
+        # this is thrown away when the callbacks change
+        methods = self._dispatch.get(method_name)
+        if methods is None:
+            methods = self._dispatch[method_name] = get_cb_methods(self.callbacks, method_name)
+
+        for method in methods:
+            method()
 
 
 # This means we'll need a TrainCB to make things work
 class TrainCB(Callback):
+    inference = True
+
     def predict(self):
         self.learn.preds = self.learn.model(self.learn.batch[0])
 
@@ -270,34 +892,66 @@ class TrainCB(Callback):
         self.learn.opt.zero_grad()
 
 
-# %% ../15c-learner.ipynb 36
+# %% ../15c-learner.ipynb 44
 class ProgressCB(Callback):
+    """
+    Shows progress bars for the epochs and batches, optionally plotting the training loss.
+    Reading the loss forces a device sync, so update_every can be used to only do this every N batches.
+    When training distributed only rank 0 shows them.
+    """
+
     order = MetricsCB.order + 1
 
-    def __init__(self, plot=False):
+    def __init__(self, plot=False, update_every=1):
         fc.store_attr()
 
     def before_fit(self):
+        self.active = is_main_process()
+        if not self.active:
+            return
+
         # Change the epochs to a progress bar around a range
         self.bar = master_bar(self.learn.epochs)
         self.learn.epochs = self.bar
         self.losses = []
 
     def before_epoch(self):
-        # Wrap the dataloaders in a progress bar
-        self.learn.dl = progress_bar(self.learn.dl, leave=False, parent=self.bar)
+        if not self.active:
+            return
+
+        # Wrap the dataloaders in a progress bar, keeping hold of it as later callbacks may wrap it again
+        total = "noinfer" if self.learn.n_batches is None else None
+        self.progress = progress_bar(self.learn.dl, total=total, leave=False, parent=self.bar)
+        self.learn.dl = self.progress
+        self.pending = []
 
     def after_batch(self):
+        if not self.active:
+            return
+
+        # Hold on to the losses on their device until we next update
+        self.pending.append(self.learn.loss.detach())
+        if len(self.pending) >= self.update_every:
+            self._update()
+
+    def after_epoch(self):
+        if self.active and self.pending:
+            self._update()
+
+    def _update(self):
+        losses = torch.stack(self.pending).float().cpu().tolist()
+        self.pending = []
+
         # Set the progresss bars comment to be the current loss
-        self.learn.dl.comment = f"{self.learn.loss:.3f}"
+        self.progress.comment = f"{losses[-1]:.3f}"
 
         # Update the plot if requested
         if self.plot and self.learn.model.training:
-            self.losses.append(self.learn.loss.item())
+            self.losses += losses
             self.bar.update_graph([[fc.L.range(self.losses), self.losses]])
 
 
-# %% ../15c-learner.ipynb 39
+# %% ../15c-learner.ipynb 52
 class MomentumLearner(Learner):
     """
     Our MomentumLearner behaves a bit differently.
@@ -306,9 +960,9 @@ class MomentumLearner(Learner):
     giving the learner "momentum".
     """
 
-    def __init__(self, model, dls, loss_func, lr, callbacks, opt_func=optim.SGD, momentum=0.85):
+    def __init__(self, model, dls, loss_func, lr, callbacks, opt_func=optim.SGD, momentum=0.85, **kwargs):
         self.momentum = momentum
-        super().__init__(model, dls, loss_func, lr, callbacks, opt_func)
+        super().__init__(model, dls, loss_func, lr, callbacks, opt_func, **kwargs)
 
     def predict(self):
         self.preds = self.model(self.batch[0])
@@ -328,7 +982,167 @@ class MomentumLearner(Learner):
                 p.grad *= self.momentum
 
 
-# %% ../15c-learner.ipynb 45
+# %% ../15c-learner.ipynb 57
+class _ScaledOptimizer:
+    """Steps the optimizer through a GradScaler so it unscales the grads first and skips steps with infs/NaNs."""
+
+    def __init__(self, opt, scaler):
+        self.opt, self.scaler = opt, scaler
+
+    def step(self):
+        scale = self.scaler.get_scale()
+        self.scaler.step(self.opt)
+        self.scaler.update()
+
+        # Learners like the MomentumLearner carry the (now unscaled) grads over to the next batch,
+        # so put them back on the loss scale the next backward will use. If the step was skipped because
+        # of infs/NaNs the scale has been cut and the grads are no use, so we zero them.
+        grads = [p.grad for group in self.opt.param_groups for p in group["params"] if p.grad is not None]
+        new_scale = self.scaler.get_scale()
+        if grads and new_scale < scale:
+            torch._foreach_zero_(grads)
+        elif grads:
+            torch._foreach_mul_(grads, new_scale)
+
+    def __getattr__(self, name):
+        return getattr(self.opt, name)
+
+
+class MixedPrecisionCB(Callback):
+    """
+    Runs predict and calc_loss under autocast.
+    The dtype defaults to bfloat16 on the CPU and float16 (with a GradScaler) on other devices.
+    """
+
+    order = DeviceCB.order + 1
+    inference = True
+
+    def __init__(self, dtype=None):
+        fc.store_attr()
+
+    def before_inference(self):
+        param = next(self.learn.model.parameters(), None)
+        self.device_type = param.device.type if param is not None else "cpu"
+        self.autocast_dtype = self.dtype or (torch.bfloat16 if self.device_type == "cpu" else torch.float16)
+
+    def before_fit(self):
+        self.before_inference()
+
+        # Only float16 needs the loss scaling
+        if self.autocast_dtype == torch.float16:
+            self.learn.grad_scaler = torch.amp.GradScaler(self.device_type)
+            self.learn.opt = _ScaledOptimizer(self.learn.opt, self.learn.grad_scaler)
+
+    def before_forward(self):
+        self.autocast = torch.autocast(self.device_type, dtype=self.autocast_dtype)
+        self.autocast.__enter__()
+
+    def after_forward(self):
+        self.autocast.__exit__(None, None, None)
+
+    def cleanup_fit(self):
+        if isinstance(self.learn.opt, _ScaledOptimizer):
+            self.learn.opt = self.learn.opt.opt
+        self.learn.grad_scaler = None
+
+
+# %% ../15c-learner.ipynb 61
+class CompileCB(Callback):
+    """Trains with a `torch.compile`d model forward (and optionally loss), falling back to eager if compiling fails."""
+
+    def __init__(self, eager_batches=3, compile_loss=False, **compile_kwargs):
+        fc.store_attr("eager_batches,compile_loss,compile_kwargs")
+        self.model = self.failed = None
+        self.times = {"eager": [], "compiled": []}
+
+    def before_fit(self):
+        # Only compile once per model, fitting again reuses the compiled forward
+        if self.learn.model is not self.model:
+            self.model, self.eager, self.loss_func = (
+                self.learn.model,
+                self.learn.model.forward,
+                self.learn.loss_func,
+            )
+            self.compiled = self.compiled_loss = None
+            self.failed = False
+            self.n_steps = 0
+            self.times = {"eager": [], "compiled": []}
+
+            try:
+                self.compiled = torch.compile(self.eager, **self.compile_kwargs)
+                self.compiled_loss = torch.compile(self.loss_func, **self.compile_kwargs) if self.compile_loss else None
+            except Exception as e:
+                self._fail(e)
+
+        param = next(self.model.parameters(), None)
+        self.cuda = param is not None and param.is_cuda
+
+        # Swap the compiled versions in on the instance, the originals are put back after the fit
+        self.model.forward = self._forward
+        if self.compile_loss:
+            self.learn.loss_func = self._loss
+
+    def _use_compiled(self):
+        return not self.failed and self.n_steps >= self.eager_batches
+
+    def _run(self, compiled, eager, *args, **kwargs):
+        if not self._use_compiled():
+            return eager(*args, **kwargs)
+
+        try:
+            return compiled(*args, **kwargs)
+        except Exception as e:
+            self._fail(e)
+            return eager(*args, **kwargs)
+
+    def _fail(self, e):
+        warnings.warn(f"torch.compile failed, falling back to eager: {e}")
+        self.failed = True
+
+    def _forward(self, *args, **kwargs):
+        return self._run(self.compiled, self.eager, *args, **kwargs)
+
+    def _loss(self, *args, **kwargs):
+        return self._run(self.compiled_loss, self.loss_func, *args, **kwargs)
+
+    def _sync(self):
+        # Make sure the timings include all of the work on the GPU
+        if self.cuda:
+            torch.cuda.synchronize()
+
+    def before_batch(self):
+        self._sync()
+        self.start = time.perf_counter()
+
+    def after_batch(self):
+        if self.learn.model.training:
+            self._sync()
+            self.times["compiled" if self._use_compiled() else "eager"].append(time.perf_counter() - self.start)
+            self.n_steps += 1
+
+    def cleanup_fit(self):
+        self.model.__dict__.pop("forward", None)
+        if self.compile_loss:
+            self.learn.loss_func = self.loss_func
+
+    def report(self):
+        """Compile time vs the steady state speedup, all times are in ms."""
+        eager, compiled = self.times["eager"], self.times["compiled"]
+        res = {"failed": self.failed}
+        if len(compiled) > 1:
+            # The first compiled step includes compiling
+            res["step_ms"] = 1000 * median(compiled[1:])
+            res["compile_ms"] = 1000 * compiled[0] - res["step_ms"]
+        if eager and "step_ms" in res:
+            res["eager_step_ms"] = 1000 * median(eager)
+            res["speedup"] = res["eager_step_ms"] / res["step_ms"]
+            saved = res["eager_step_ms"] - res["step_ms"]
+            res["break_even_steps"] = math.ceil(res["compile_ms"] / saved) if saved > 0 else None
+
+        return res
+
+
+# %% ../15c-learner.ipynb 67
 class LRFinderCB(Callback):
     def __init__(self, gamma=1.3):
         fc.store_attr()
@@ -0,0 +1,181 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../15d-profiling.ipynb.
+
+# %% auto 0
+__all__ = ["TimingHist", "ProfileCB"]
+
+# %% ../15d-profiling.ipynb 1
+import time
+from bisect import bisect_right
+
+import torch
+
+import fastcore.all as fc
+
+import miniai.learner as ln
+
+
+# %% ../15d-profiling.ipynb 8
+class TimingHist:
+    """A fixed size histogram of durations (in seconds) with log spaced buckets."""
+
+    def __init__(self, lo=1e-6, hi=100.0, n_bins=160):
+        ratio = (hi / lo) ** (1 / n_bins)
+        self.edges = [lo * ratio**i for i in range(n_bins + 1)]
+        self.counts = [0] * (n_bins + 2)  # Extra buckets for under/over the range
+        self.n, self.total, self.min, self.max = 0, 0.0, float("inf"), 0.0
+
+    def add(self, t):
+        self.counts[bisect_right(self.edges, t)] += 1
+        self.n += 1
+        self.total += t
+        self.min = min(self.min, t)
+        self.max = max(self.max, t)
+
+    @property
+    def mean(self):
+        return self.total / self.n if self.n else 0.0
+
+    def quantile(self, q):
+        """Estimate the q quantile by interpolating within the bucket it falls in."""
+        if not self.n:
+            return 0.0
+
+        target, seen = q * self.n, 0
+        for idx, count in enumerate(self.counts):
+            if count and seen + count >= target:
+                lo = max(self.edges[idx - 1] if idx > 0 else self.min, self.min)
+                hi = min(self.edges[idx] if idx < len(self.edges) else self.max, self.max)
+                return lo + (hi - lo) * (target - seen) / count
+            seen += count
+
+        return self.max
+
+
+# %% ../15d-profiling.ipynb 11
+class _TimedLoader:
+    """Wraps a dataloader timing how long we wait for each batch."""
+
+    def __init__(self, dl, hist):
+        self.dl, self.hist = dl, hist
+
+    def __len__(self):
+        return len(self.dl)
+
+    def __iter__(self):
+        it = iter(self.dl)
+        while True:
+            start = time.perf_counter()
+            try:
+                batch = next(it)
+            except StopIteration:
+                return
+            self.hist.add(time.perf_counter() - start)
+            yield batch
+
+
+class ProfileCB(ln.Callback):
+    """Times the data loading, training steps and callbacks of a fit, printing a summary at the end."""
+
+    # Wrap the dataloader before anything else so we time it and not the other callbacks
+    order = -10
+    phases = ("predict", "calc_loss", "backward", "step", "zero_grad")
+
+    def __init__(self, profile_batches=None, trace_path=None, sync=None):
+        fc.store_attr()
+        self.prof, self.profiling = None, False
+
+    def before_fit(self):
+        self.hists = {name: TimingHist() for name in ("data",) + self.phases + ("callbacks",)}
+        self.n_train = 0
+        self._sync = (
+            torch.cuda.synchronize if (self.sync or self.sync is None and torch.cuda.is_available()) else fc.noop
+        )
+
+        # Timed versions of the learners methods go on the instance, and come off again after the fit
+        for name in self.phases:
+            setattr(
+                self.learn,
+                name,
+                self._timed(getattr(self.learn, name), self.hists[name]),
+            )
+
+        self.learn.callback = self._timed_callback(self.learn.callback)
+        self.start = time.perf_counter()
+
+    def _timed(self, fn, hist):
+        def _fn(*args, **kwargs):
+            self._sync()
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._sync()
+                hist.add(time.perf_counter() - start)
+
+        return _fn
+
+    def _timed_callback(self, callback):
+        hist = self.hists["callbacks"]
+
+        def _callback(method_name):
+            start = time.perf_counter()
+            try:
+                callback(method_name)
+            finally:
+                hist.add(time.perf_counter() - start)
+
+        return _callback
+
+    def before_epoch(self):
+        self.learn.dl = _TimedLoader(self.learn.dl, self.hists["data"])
+
+    def before_batch(self):
+        if self.profile_batches is None or not self.learn.model.training:
+            return
+
+        start, end = self.profile_batches
+        if self.n_train == start:
+            activities = [torch.profiler.ProfilerActivity.CPU]
+            if torch.cuda.is_available():
+                activities.append(torch.profiler.ProfilerActivity.CUDA)
+
+            self.prof = torch.profiler.profile(activities=activities, record_shapes=True)
+            self.prof.__enter__()
+            self.profiling = True
+
+    def after_batch(self):
+        if not self.learn.model.training:
+            return
+
+        self.n_train += 1
+        if self.profile_batches is not None and self.n_train == self.profile_batches[1]:
+            self._stop_profiler()
+
+    def _stop_profiler(self):
+        if self.profiling:
+            self.prof.__exit__(None, None, None)
+            self.profiling = False
+            if self.trace_path is not None:
+                self.prof.export_chrome_trace(str(self.trace_path))
+
+    def after_fit(self):
+        self.summary()
+
+    def cleanup_fit(self):
+        self._stop_profiler()
+        for name in self.phases + ("callback",):
+            self.learn.__dict__.pop(name, None)
+
+    def summary(self):
+        """Print a table of how long each phase took."""
+        elapsed = time.perf_counter() - self.start
+        print(
+            f"{'phase':<10} {'n':>7} {'total s':>9} {'%':>6} {'mean ms':>9} {'p50 ms':>9} {'p90 ms':>9} {'max ms':>9}"
+        )
+        for name, hist in self.hists.items():
+            print(
+                f"{name:<10} {hist.n:>7} {hist.total:>9.3f} {100 * hist.total / elapsed:>6.1f} {1000 * hist.mean:>9.3f} "
+                f"{1000 * hist.quantile(0.5):>9.3f} {1000 * hist.quantile(0.9):>9.3f} {1000 * hist.max:>9.3f}"
+            )
+
+        print(f"Total {elapsed:.3f}s")
@@ -0,0 +1,138 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../15i-streaming.ipynb.
+
+# %% auto 0
+__all__ = ["StreamingDataset"]
+
+# %% ../15i-streaming.ipynb 1
+from glob import glob
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+import torch
+import torch.distributed as dist
+from torch.utils.data import IterableDataset, get_worker_info
+
+import miniai.learner as ln
+
+
+# %% ../15i-streaming.ipynb 4
+def _shard():
+    """This worker's shard number and the total number of shards, across the workers in all the processes."""
+    rank, world_size = (dist.get_rank(), dist.get_world_size()) if ln.is_distributed() else (0, 1)
+    info = get_worker_info()
+    worker, n_workers = (info.id, info.num_workers) if info is not None else (0, 1)
+    return rank * n_workers + worker, world_size * n_workers
+
+
+def _is_parquet(fname):
+    return Path(fname).suffix in (".parquet", ".pq")
+
+
+def _cat(a, b):
+    return b if a is None else tuple(torch.cat(o) for o in zip(a, b))
+
+
+def _split(block, n):
+    return tuple(o[:n] for o in block), tuple(o[n:] for o in block)
+
+
+def _shuffled(blocks, size, gen):
+    """Approximately shuffle a stream of blocks of tensors, keeping up to size rows in a buffer."""
+    buf = None
+    for block in blocks:
+        buf = _cat(buf, block)
+        if len(buf[0]) > size:
+            perm = torch.randperm(len(buf[0]), generator=gen)
+            out, buf = _split(tuple(o[perm] for o in buf), len(buf[0]) - size)
+            yield out
+
+    if buf is not None:
+        perm = torch.randperm(len(buf[0]), generator=gen)
+        yield tuple(o[perm] for o in buf)
+
+
+def _batched(blocks, batch_size, drop_last):
+    """Turn a stream of blocks of tensors into batches of batch_size."""
+    pending = None
+    for block in blocks:
+        pending = _cat(pending, block)
+        n = len(pending[0]) // batch_size * batch_size
+        for i in range(0, n, batch_size):
+            yield tuple(o[i : i + batch_size] for o in pending)
+        pending = tuple(o[n:] for o in pending)
+
+    if pending is not None and len(pending[0]) and not drop_last:
+        yield pending
+
+
+class StreamingDataset(IterableDataset):
+    """
+    Streams batches from CSV or Parquet files a chunk at a time, each DataLoader worker in each process reading its
+    own share of the rows. tfm turns a DataFrame chunk into a tuple of tensors with one row per row of the chunk.
+    """
+
+    def __init__(
+        self,
+        files,
+        tfm,
+        batch_size=64,
+        chunk_size=10_000,
+        shuffle_buffer=0,
+        drop_last=False,
+        **read_kwargs,
+    ):
+        self.files = sorted(glob(str(files))) if isinstance(files, (str, Path)) else list(files)
+        if not self.files:
+            raise FileNotFoundError(f"No files match {files}")
+        self.tfm, self.batch_size, self.chunk_size = tfm, batch_size, chunk_size
+        self.shuffle_buffer, self.drop_last, self.read_kwargs = (
+            shuffle_buffer,
+            drop_last,
+            read_kwargs,
+        )
+
+    def _parts(self):
+        """The parts of the files that we can read independently: row groups of Parquet files or whole CSVs."""
+        return [
+            (fname, group)
+            for fname in self.files
+            for group in (range(pq.ParquetFile(fname).num_row_groups) if _is_parquet(fname) else [None])
+        ]
+
+    def _read(self, fname, group):
+        if group is None:
+            yield from pd.read_csv(fname, chunksize=self.chunk_size, **self.read_kwargs)
+        else:
+            for batch in pq.ParquetFile(fname).iter_batches(self.chunk_size, [group], **self.read_kwargs):
+                yield batch.to_pandas()
+
+    def _chunks(self, gen):
+        shard, n_shards = _shard()
+        parts = self._parts()
+        if len(parts) >= n_shards:
+            # Give each shard whole parts, shuffling the order it reads them in
+            parts = parts[shard::n_shards]
+            if self.shuffle_buffer:
+                parts = [parts[i] for i in torch.randperm(len(parts), generator=gen)]
+            for part in parts:
+                yield from self._read(*part)
+            return
+
+        # Otherwise every shard reads everything and keeps every n_shards'th row
+        start = 0
+        for part in parts:
+            for chunk in self._read(*part):
+                yield chunk.iloc[(shard - start) % n_shards :: n_shards]
+                start += len(chunk)
+
+    def __iter__(self):
+        # The DataLoader seeds pytorch differently for each worker and each epoch
+        gen = torch.Generator().manual_seed(int(torch.randint(2**62, ())))
+        blocks = (self.tfm(chunk) for chunk in self._chunks(gen))
+        blocks = (o for o in blocks if len(o[0]))
+        if self.shuffle_buffer:
+            blocks = _shuffled(blocks, self.shuffle_buffer, gen)
+        return _batched(blocks, self.batch_size, self.drop_last)
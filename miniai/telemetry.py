@@ -0,0 +1,188 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../15k-telemetry.ipynb.
+
+# %% auto 0
+__all__ = ["TelemetrySink", "load_telemetry", "TelemetryCB"]
+
+# %% ../15k-telemetry.ipynb 1
+import os
+import threading
+from pathlib import Path
+from queue import Queue
+from collections import defaultdict
+
+import numpy as np
+
+import torch
+
+import miniai.learner as ln
+
+
+# %% ../15k-telemetry.ipynb 8
+def _to_numpy(values):
+    if isinstance(values[0], torch.Tensor):
+        return ln.to_cpu(torch.stack(values)).numpy()
+    return np.asarray(values)
+
+
+def _chunks(path, table):
+    return sorted(Path(path).glob(f"{table}-*.npz"))
+
+
+class TelemetrySink:
+    """Buffers rows of values for each table and appends them to chunked .npz files in path on a background thread."""
+
+    def __init__(self, path, flush_every=1000):
+        self.path, self.flush_every = Path(path), flush_every
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.rows = defaultdict(list)
+        self.queue, self.thread, self.error = Queue(), None, None
+
+    def log(self, table, **values):
+        """Add a row to table, tensors can be left on their device."""
+        self._raise()
+        rows = self.rows[table]
+        rows.append({k: v.detach() if isinstance(v, torch.Tensor) else v for k, v in values.items()})
+        if len(rows) >= self.flush_every:
+            self._flush(table)
+
+    def _flush(self, table):
+        rows = self.rows.pop(table, None)
+        if not rows:
+            return
+
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+        self.queue.put((table, rows))
+
+    def flush(self):
+        """Write out everything that's been logged so far, and wait for it to be written."""
+        for table in list(self.rows):
+            self._flush(table)
+        self.queue.join()
+        self._raise()
+
+    def _run(self):
+        while True:
+            table, rows = self.queue.get()
+            try:
+                self._write(table, rows)
+            except Exception as e:
+                self.error = e
+            finally:
+                self.queue.task_done()
+
+    def _write(self, table, rows):
+        cols = {k: _to_numpy([row[k] for row in rows]) for k in rows[0]}
+        chunks = _chunks(self.path, table)
+        n = int(chunks[-1].stem.rsplit("-", 1)[1]) + 1 if chunks else 0
+        fname = self.path / f"{table}-{n:06d}.npz"
+
+        # Save then rename so there's never a half written file
+        tmp = fname.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, **cols)
+        os.replace(tmp, fname)
+
+    def last(self, table, column):
+        """The last value of column written to table, or None if there isn't one."""
+        chunks = _chunks(self.path, table)
+        if not chunks:
+            return None
+        with np.load(chunks[-1]) as chunk:
+            return chunk[column][-1].item() if column in chunk.files else None
+
+    def _raise(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+
+# %% ../15k-telemetry.ipynb 10
+def load_telemetry(path, table=None):
+    """The columns of table in path as numpy arrays, or a dict of all the tables if table is None."""
+    if table is None:
+        tables = {f.stem.rsplit("-", 1)[0] for f in Path(path).glob("*.npz")}
+        return {t: load_telemetry(path, t) for t in sorted(tables)}
+
+    cols = defaultdict(list)
+    for fname in _chunks(path, table):
+        with np.load(fname) as chunk:
+            for k in chunk.files:
+                cols[k].append(chunk[k])
+
+    return {k: np.concatenate(v) for k, v in cols.items()}
+
+
+# %% ../15k-telemetry.ipynb 13
+def _histories(cb):
+    """The `StatsHistory`s of a hooks callback, with the index of the layer they're for."""
+    if hasattr(cb.hooks, "history"):
+        return [(None, cb.hooks.history)]
+    return [(i, hook.stats) for i, hook in enumerate(cb.hooks) if hasattr(hook, "stats")]
+
+
+class TelemetryCB(ln.Callback):
+    """Streams the losses, learning rates, metrics and the stats of hooks callbacks to a `TelemetrySink` in path."""
+
+    # After the metrics have been computed
+    order = ln.MetricsCB.order + 1
+
+    def __init__(self, path, hooks=(), flush_every=1000):
+        self.sink, self.hooks = TelemetrySink(path, flush_every), list(hooks)
+
+    def before_fit(self):
+        # Number the steps on from anything already in path, so fitting again (or resuming) doesn't repeat them
+        self.sink.flush()
+        step, run = self.sink.last("batch", "step"), self.sink.last("batch", "run")
+        self.n_steps = 0 if step is None else step + 1
+        self.run = 0 if run is None else run + 1
+        self.seen = {}
+
+    def after_batch(self):
+        if not self.learn.model.training or not ln.is_main_process():
+            return
+
+        lr = self.learn.opt.param_groups[0]["lr"]
+        self.sink.log(
+            "batch",
+            step=self.n_steps,
+            run=self.run,
+            epoch=self.learn.epoch,
+            loss=self.learn.loss,
+            lr=lr,
+        )
+        for cb in self.hooks:
+            self._log_stats(cb)
+        self.n_steps += 1
+
+    def _log_stats(self, cb):
+        for layer, history in _histories(cb):
+            # Only log the stats that have been recorded since we last looked
+            key = (id(cb), layer)
+            if history.total == self.seen.get(key, 0):
+                continue
+            self.seen[key] = history.total
+
+            names = history.names or [f"stat{i}" for i in range(len(history))]
+            layer = {} if layer is None else {"layer": layer}
+            self.sink.log(
+                type(cb).__name__,
+                step=self.n_steps,
+                **layer,
+                **dict(zip(names, history.last())),
+            )
+
+    def after_epoch(self):
+        metrics = getattr(self.learn, "metrics", None)
+        if metrics is not None and ln.is_main_process():
+            self.sink.log(
+                "epoch",
+                run=self.run,
+                epoch=self.learn.epoch,
+                train=self.learn.model.training,
+                **metrics.values,
+            )
+
+    def cleanup_fit(self):
+        self.sink.flush()
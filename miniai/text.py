@@ -0,0 +1,124 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../15j-text.ipynb.
+
+# %% auto 0
+__all__ = ["seq_lengths", "BucketBatchSampler", "collate_pad", "padding_stats"]
+
+# %% ../15j-text.ipynb 1
+from operator import itemgetter
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+import pyarrow.compute as pc
+
+import torch
+import torch.nn.functional as F
+from torch.nn.utils.rnn import pad_sequence
+from torch.utils.data import Sampler
+
+import miniai.datasets as ds
+
+
+# %% ../15j-text.ipynb 6
+def seq_lengths(dataset, column="input_ids"):
+    """The length of each item's column in a Hugging Face dataset, without loading them all into python."""
+    return pc.list_value_length(dataset.with_format("arrow")[column]).to_numpy()
+
+
+class BucketBatchSampler(Sampler):
+    """Batches of indices of items of similar lengths, from buckets of bucket_size batches."""
+
+    def __init__(
+        self,
+        lengths,
+        batch_size,
+        bucket_size=50,
+        shuffle=True,
+        drop_last=False,
+        generator=None,
+    ):
+        self.lengths = torch.tensor(np.asarray(lengths))
+        self.batch_size, self.bucket_size, self.shuffle, self.drop_last = (
+            batch_size,
+            bucket_size,
+            shuffle,
+            drop_last,
+        )
+        self.generator = generator
+
+    @classmethod
+    def from_dataset(cls, dataset, batch_size, train=True, column="input_ids", **kwargs):
+        """A sampler for a Hugging Face dataset, shuffled for training, that can be passed to `DataLoaders.from_dsd`."""
+        return cls(seq_lengths(dataset, column), batch_size, shuffle=train, **kwargs)
+
+    def __len__(self):
+        n = len(self.lengths)
+        return n // self.batch_size if self.drop_last else -(-n // self.batch_size)
+
+    def __iter__(self):
+        n = len(self.lengths)
+        if not self.shuffle:
+            yield from self._batches(torch.arange(n))
+            return
+
+        gen = self.generator
+        if gen is None:
+            gen = torch.Generator().manual_seed(int(torch.randint(2**62, ())))
+        idxs = torch.randperm(n, generator=gen)
+        batches = [b for bucket in idxs.split(self.batch_size * self.bucket_size) for b in self._batches(bucket)]
+        for i in torch.randperm(len(batches), generator=gen):
+            yield batches[i]
+
+    def _batches(self, idxs):
+        """Sort idxs by length, longest first, and split them into batches."""
+        idxs = idxs[self.lengths[idxs].argsort(descending=True, stable=True)]
+        batches = [b.tolist() for b in idxs.split(self.batch_size)]
+        if self.drop_last and len(batches[-1]) < self.batch_size:
+            batches = batches[:-1]
+        return batches
+
+
+# %% ../15j-text.ipynb 8
+def _is_seq(o):
+    return isinstance(o, (Sequence, np.ndarray, torch.Tensor)) and not isinstance(o, str) and np.ndim(o) > 0
+
+
+def _pad(seqs, value, multiple_of):
+    res = pad_sequence([torch.as_tensor(o) for o in seqs], batch_first=True, padding_value=value)
+    extra = -res.shape[1] % multiple_of
+    return F.pad(res, (0, extra), value=value) if extra else res
+
+
+def collate_pad(dataset, pad_id=0, multiple_of=1):
+    """
+    Creates function that collates a batch of items or columns into the features listed in dataset.features,
+    padding sequences to the longest in the batch.
+    """
+    get = itemgetter(*dataset.features)
+
+    def _collate(name, col):
+        if isinstance(col, list) and len(col) and _is_seq(col[0]):
+            return _pad(col, pad_id if name == "input_ids" else 0, multiple_of)
+        return ds.column_to_tensor(col)
+
+    def _f(batch):
+        cols = batch if isinstance(batch, Mapping) else {k: [o[k] for o in batch] for k in batch[0]}
+        return get({name: _collate(name, col) for name, col in cols.items()})
+
+    return _f
+
+
+# %% ../15j-text.ipynb 10
+def padding_stats(batches, lengths, pad_to=None):
+    """The number of real and padding tokens in batches of indices, padded to their longest item or pad_to."""
+    lengths = np.asarray(lengths)
+    tokens = padded = 0
+    for b in batches:
+        lens = lengths[list(b)]
+        tokens += lens.sum()
+        padded += len(lens) * (lens.max() if pad_to is None else pad_to)
+
+    return {
+        "tokens": int(tokens),
+        "padding": int(padded - tokens),
+        "padding_pct": float(100 * (padded - tokens) / padded),
+    }
@@ -1,11 +1,11 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../14-minibatch-training.ipynb.
 
 # %% auto 0
-__all__ = ["accuracy", "Dataset", "fit", "get_dls"]
+__all__ = ["accuracy", "Dataset", "TensorBatchSampler", "batch_dl", "fit", "get_dls"]
 
 # %% ../14-minibatch-training.ipynb 1
 import torch
-from torch.utils.data import DataLoader
+from torch.utils.data import DataLoader, BatchSampler, RandomSampler, SequentialSampler
 
 
 # %% ../14-minibatch-training.ipynb 23
@@ -28,6 +28,26 @@ class Dataset:
 
 
 # %% ../14-minibatch-training.ipynb 60
+class TensorBatchSampler(BatchSampler):
+    """A `BatchSampler` that yields a tensor of indices for each batch."""
+
+    def __iter__(self):
+        # Turning the whole epoch's indices into a tensor at once is much quicker than doing it a batch at a time
+        idxs = torch.tensor(list(self.sampler), dtype=torch.long)
+        if self.drop_last:
+            idxs = idxs[: len(self) * self.batch_size]
+        yield from idxs.split(self.batch_size)
+
+
+def batch_dl(dataset, batch_size, shuffle=False, drop_last=False, sampler=None, **kwargs):
+    """A `DataLoader` that gets each batch from dataset by indexing it with a tensor, rather than an item at a time."""
+    if sampler is None:
+        sampler = RandomSampler(dataset) if shuffle else SequentialSampler(dataset)
+
+    return DataLoader(dataset, batch_size=None, sampler=TensorBatchSampler(sampler, batch_size, drop_last), **kwargs)
+
+
+# %% ../14-minibatch-training.ipynb 63
 def fit(epochs, model, loss_func, opt, train_dl, valid_dl):
     for epoch in range(epochs):
         # Some layers behave differently during training and validation so we have to tell them
@@ -65,7 +85,9 @@ def fit(epochs, model, loss_func, opt, train_dl, valid_dl):
 
 
 def get_dls(train_ds, valid_ds, batch_size, **kwargs):
+    # Our datasets can be indexed a batch at a time, unless there's a collate_fn expecting a list of items
+    dl = batch_dl if isinstance(train_ds, Dataset) and "collate_fn" not in kwargs else DataLoader
     return (
-        DataLoader(train_ds, batch_size=batch_size, shuffle=True, **kwargs),
-        DataLoader(valid_ds, batch_size=batch_size * 2, **kwargs),
+        dl(train_ds, batch_size, shuffle=True, **kwargs),
+        dl(valid_ds, batch_size * 2, **kwargs),
     )